@@ -0,0 +1,77 @@
+"""
+Benchmark of Python time per list request spent in filterset application and SQL compilation.
+
+Usage:
+    python benchmarks/filter_compilation.py [--number 5000]
+
+It compares FilterSet.qs with fango.filters.apply_filterset, which rebinds cached lookups
+for repeated parameter shapes.
+
+"""
+
+import argparse
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+settings.configure(
+    DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}},
+    INSTALLED_APPS=["django.contrib.contenttypes", "django.contrib.auth"],
+    USE_TZ=False,
+)
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
+
+from fango.filters import apply_filterset, generate_filterset_by_pydantic  # noqa: E402
+
+
+class UserSchema(BaseModel):
+    id: int
+    username: str
+    is_staff: bool
+    date_joined: datetime
+
+
+def compile_sql(queryset) -> None:
+    queryset.query.get_compiler(connection=connection).as_sql()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=5000)
+    args = parser.parse_args()
+
+    filterset_class = generate_filterset_by_pydantic(UserSchema)
+    params = {"username_starts": "adm", "is_staff": "true", "date_joined_gte": "2024-01-01T00:00:00", "id_lt": "1000"}
+    queryset = User.objects.order_by("-pk")[:21]
+    base = User.objects.all()
+
+    cases = {
+        "FilterSet.qs": lambda: filterset_class(params, queryset=base).qs,
+        "apply_filterset": lambda: apply_filterset(filterset_class, params, base),
+        "SQL compile": lambda: compile_sql(queryset),
+    }
+
+    print(f"{'case':<20}{'us/request':>12}")
+
+    for name, case in cases.items():
+        case()
+        elapsed = timeit.timeit(case, number=args.number)
+        print(f"{name:<20}{elapsed / args.number * 1e6:>12.1f}")
+
+    filtered = apply_filterset(filterset_class, params, base).order_by("-pk")[:21]
+    elapsed = timeit.timeit(lambda: compile_sql(filtered), number=args.number)
+    print(f"{'filtered compile':<20}{elapsed / args.number * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Microbenchmark of sign and verify throughput for fango JWT backends.
+
+Usage:
+    python benchmarks/jwt_backends.py [--algorithm HS256|RS256] [--number 5000]
+
+RS256 requires cryptography package, PyJWT backend requires PyJWT package.
+
+"""
+
+import argparse
+import sys
+import timeit
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from django.conf import settings  # noqa: E402
+
+settings.configure()
+
+from django.utils import timezone  # noqa: E402
+
+from fango.tokens import BACKENDS, KeyRegistry  # noqa: E402
+
+
+def get_keys(algorithm: str) -> tuple[bytes, bytes]:
+    if algorithm.startswith("HS"):
+        secret = b"fango-benchmark-secret-fango-benchmark-secret"
+        return secret, secret
+
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return private, public
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--algorithm", default="HS256")
+    parser.add_argument("--number", type=int, default=5000)
+    args = parser.parse_args()
+
+    private, public = get_keys(args.algorithm)
+    claims = {"exp": timezone.now() + timedelta(minutes=5), "user_id": 1, "token_type": "access"}
+
+    print(f"{'backend':<10}{'sign/s':>12}{'verify/s':>12}")
+
+    for name, backend_class in BACKENDS.items():
+        try:
+            backend = backend_class()
+        except Exception as e:
+            print(f"{name:<10}  skipped: {e}")
+            continue
+
+        registry = KeyRegistry(backend, args.algorithm, {None: (private, public)})
+        token = registry.encode(claims)
+
+        sign = timeit.timeit(lambda: registry.encode(claims), number=args.number)
+        verify = timeit.timeit(lambda: registry.decode(token), number=args.number)
+
+        print(f"{name:<10}{args.number / sign:>12.0f}{args.number / verify:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,13 @@ from pydantic import Field
 PK = int | UUID
 
 
+class Searchable:
+    """
+    Marker for full-text searchable fields, like Annotated[str, Searchable].
+
+    """
+
+
 def _check(type_: type, annotation) -> bool:
     return annotation == type_ or type_ in typing.get_args(annotation)
 
@@ -37,3 +44,7 @@ def is_numeric(field: Field) -> bool:
 
 def is_list(field: Field) -> bool:
     return _check(list, field.annotation)
+
+
+def is_searchable(field: Field) -> bool:
+    return any(x is Searchable or isinstance(x, Searchable) for x in field.metadata)
@@ -0,0 +1,152 @@
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, router
+from django.db.models import Model
+from django_filters import BooleanFilter, FilterSet
+
+from fango.filters import ArrayFilter, LimitedListFilter, SearchFilter
+from fango.log import logger
+
+__all__ = ["arecord_filter_usage", "get_filter_usage", "get_index_report"]
+
+FILTER_ADVISOR = getattr(settings, "FILTER_ADVISOR", False)
+FILTER_USAGE_FLUSH_INTERVAL = getattr(settings, "FILTER_USAGE_FLUSH_INTERVAL", 60)
+FILTER_USAGE_CACHE_KEY = "fango_filter_usage"
+
+BTREE, TRIGRAM, GIN = "btree", "trigram", "gin"
+TRIGRAM_LOOKUPS = {"icontains", "istartswith", "iendswith", "contains", "startswith", "endswith"}
+
+_usage: defaultdict[tuple[str, str], list[float]] = defaultdict(lambda: [0, 0.0])
+_last_flush = time.monotonic()
+
+
+async def arecord_filter_usage(model: type[Model], filter_names: list[str], duration: float) -> None:
+    """
+    Function records used filters with query latency, stats are flushed to django cache
+    every FILTER_USAGE_FLUSH_INTERVAL seconds to be visible for filter_indexes command.
+
+    """
+    global _last_flush
+
+    label = model._meta.label
+    for filter_name in filter_names:
+        stats = _usage[(label, filter_name)]
+        stats[0] += 1
+        stats[1] += duration
+
+    logger.info(f"[filters] {label} {', '.join(filter_names)}: {duration * 1000:.1f}ms")
+
+    if time.monotonic() - _last_flush > FILTER_USAGE_FLUSH_INTERVAL:
+        _last_flush = time.monotonic()
+        usage = await cache.aget(FILTER_USAGE_CACHE_KEY) or {}
+
+        for key, (count, total) in _usage.items():
+            stored = usage.get(key, (0, 0.0))
+            usage[key] = (stored[0] + count, stored[1] + total)
+
+        _usage.clear()
+        await cache.aset(FILTER_USAGE_CACHE_KEY, usage, timeout=None)
+
+
+def get_filter_usage() -> dict[tuple[str, str], tuple[int, float]]:
+    """
+    Function returns flushed and local filter usage as (count, total seconds) by (model label, filter name).
+
+    """
+    usage = dict(cache.get(FILTER_USAGE_CACHE_KEY) or {})
+
+    for key, (count, total) in _usage.items():
+        stored = usage.get(key, (0, 0.0))
+        usage[key] = (stored[0] + count, stored[1] + total)
+
+    return usage
+
+
+def _get_required_index(filter_instance) -> str | None:
+    if isinstance(filter_instance, BooleanFilter):
+        return None
+
+    # Search is served by GIN index over search vector, see fango.filters.search_index.
+    if isinstance(filter_instance, ArrayFilter | LimitedListFilter | SearchFilter):
+        return GIN
+
+    if filter_instance.lookup_expr in TRIGRAM_LOOKUPS:
+        return TRIGRAM
+
+    return BTREE
+
+
+def _get_indexes(model: type[Model]) -> list[dict]:
+    """
+    Function returns indexes of model table from database introspection.
+
+    """
+    connection = connections[router.db_for_read(model)]
+
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+
+    return [x for x in constraints.values() if x.get("index") or x.get("primary_key") or x.get("unique")]
+
+
+def _has_index(indexes: list[dict], column: str, required: str) -> bool:
+    """
+    Function checks that column is served by index of required kind.
+
+    Trigram support is detected by gin or gist index over column or expression with column,
+    opclass is not reported by all database backends.
+
+    """
+    for index in indexes:
+        columns = index.get("columns") or []
+        index_type = (index.get("type") or "").lower()
+        definition = index.get("definition") or ""
+
+        if required == BTREE and columns[:1] == [column] and index_type in ("", "idx", "btree"):
+            return True
+
+        if required in (TRIGRAM, GIN) and index_type in ("gin", "gist"):
+            if column in columns or f'"{column}"' in definition or f"({column}" in definition:
+                return True
+
+    return False
+
+
+def get_index_report(model: type[Model], filterset_class: type[FilterSet]) -> list[dict]:
+    """
+    Function returns generated filters of model with usage stats, required and existing indexes.
+
+    """
+    usage = get_filter_usage()
+    indexes = _get_indexes(model)
+    report = []
+
+    for filter_name, filter_instance in filterset_class.base_filters.items():
+        try:
+            column = model._meta.get_field(filter_instance.field_name).column
+        except FieldDoesNotExist:
+            continue
+
+        if column is None:
+            continue
+
+        required = _get_required_index(filter_instance)
+        count, total = usage.get((model._meta.label, filter_name), (0, 0.0))
+
+        report.append(
+            {
+                "filter": filter_name,
+                "column": column,
+                "lookup": filter_instance.lookup_expr,
+                "used": count,
+                "avg_ms": round(total / count * 1000, 1) if count else None,
+                "required_index": required,
+                "has_index": required is None or _has_index(indexes, column, required),
+            }
+        )
+
+    return report
@@ -7,46 +7,114 @@ __all__ = [
     "create_access_token",
     "set_context_user",
     "context_user",
+    "context_request",
+    "ClaimsUser",
+    "claims_cache",
+    "user_cache",
 ]
 
+import asyncio
 import contextvars
+import hashlib
+import time
 from datetime import timedelta
+from functools import lru_cache
+from typing import Any
 from uuid import uuid4
 
 from django.conf import settings
 from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
 from django.utils import timezone
 from fastapi import HTTPException, Request
-from jose import JWTError, jwt
 
+from fango.cache import MISSING, LRUCache
+from fango.tokens import TokenError, get_key_registry
 from fango.utils import run_async
 
 context_user = contextvars.ContextVar("context_user")
+context_request = contextvars.ContextVar("context_request", default=None)
+claims_cache = LRUCache(maxsize=getattr(settings, "JWT_CLAIMS_CACHE_SIZE", 1024))
+user_cache = LRUCache(maxsize=getattr(settings, "USER_CACHE_SIZE", 1024))
+
+USER_CACHE_TTL = getattr(settings, "USER_CACHE_TTL", 30)
+USER_CACHE_SHARED = getattr(settings, "USER_CACHE_SHARED", False)
+
+_user_lookups: dict[Any, asyncio.Future] = {}
 
 
 def decode_token(auth: str) -> dict:
+    """
+    Function returns verified token claims.
+
+    Claims are cached per process by token digest until token expiration,
+    so signature is verified once per token.
+
+    """
     try:
         _, token = auth.split()
-        return jwt.decode(
-            token,
-            settings.PUBLIC_KEY,
-            algorithms=[settings.ALGORITHM],
-            options={"verify_aud": False},
-        )
-    except (ValueError, UnicodeDecodeError, JWTError) as e:
+        key = hashlib.sha256(token.encode()).digest()
+
+        if (claims := claims_cache.get(key)) is MISSING:
+            claims = get_key_registry().decode(token)
+            claims_cache.set(key, claims, expires_at=claims.get("exp"))
+
+        return dict(claims)
+    except (ValueError, UnicodeDecodeError, TokenError) as e:
         raise HTTPException(status_code=403, detail=str(e))
 
 
+class ClaimsUser:
+    """
+    Lightweight principal built from token claims without database query.
+
+    It has user_id as pk and claims listed in JWT_USER_CLAIMS setting.
+    Any other attribute is taken from User instance, loaded on first access.
+    In async context use `await user.aget_user()` before it.
+
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, claims: dict) -> None:
+        self._user = None
+        self.pk = self.id = claims["user_id"]
+
+        for claim in getattr(settings, "JWT_USER_CLAIMS", ()):
+            if claim in claims:
+                setattr(self, claim, claims[claim])
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        return getattr(self.get_user(), name)
+
+    def __repr__(self) -> str:
+        return f"<ClaimsUser: {self.pk}>"
+
+    def get_user(self) -> User:
+        if self._user is None:
+            self._user = _get_user_by_id(self.pk)
+        return self._user
+
+    async def aget_user(self) -> User:
+        if self._user is None:
+            self._user = await _aget_user_by_id(self.pk)
+        return self._user
+
+
 def get_user(request: Request) -> User | None:
     """
     Function returns User instance by token.
 
     """
-    UserModel: User = get_user_model()  # type: ignore
     if access_token := request.headers.get("Authorization"):
         payload = decode_token(access_token)
-        return UserModel.objects.only(*getattr(settings, "REQUEST_USER_FIELDS", ())).get(id=payload["user_id"])
+        return _get_user_by_id(payload["user_id"])
 
 
 async def get_user_async(request: Request) -> User | None:
@@ -54,18 +122,133 @@ async def get_user_async(request: Request) -> User | None:
     Function returns User instance by token async.
 
     """
-    UserModel: User = get_user_model()  # type: ignore
     if access_token := request.headers.get("Authorization"):
         payload = decode_token(access_token)
-        return await UserModel.objects.only(*getattr(settings, "REQUEST_USER_FIELDS", ())).aget(id=payload["user_id"])
+        return await _aget_user_by_id(payload["user_id"])
+
+
+@lru_cache(maxsize=None)
+def _get_user_snapshot_fields() -> tuple[str, ...]:
+    """
+    Function returns user columns stored in cache, it is REQUEST_USER_FIELDS
+    with primary key in model field order, or all concrete fields.
+
+    """
+    UserModel: User = get_user_model()  # type: ignore
+    fields = set(getattr(settings, "REQUEST_USER_FIELDS", ()))
+
+    return tuple(
+        field.attname
+        for field in UserModel._meta.concrete_fields
+        if not fields or field.primary_key or field.name in fields or field.attname in fields
+    )
+
+
+def _get_shared_user_cache_key(user_id: Any) -> str:
+    return f"fango_user_snapshot_{user_id}"
+
+
+def _build_user(values: tuple) -> User:
+    """
+    Function builds User instance from cached snapshot, not loaded fields are deferred.
+
+    """
+    UserModel: User = get_user_model()  # type: ignore
+    return UserModel.from_db(UserModel.objects.db, _get_user_snapshot_fields(), values)
 
 
-async def set_context_user(request: Request) -> None:
+def _store_user_snapshot(user_id: Any, values: tuple) -> None:
+    if USER_CACHE_TTL:
+        user_cache.set(user_id, values, expires_at=time.time() + USER_CACHE_TTL)
+
+
+def _get_user_by_id(user_id: Any) -> User:
+    """
+    Function returns User instance by id from local cache, shared cache or database.
+
+    """
+    UserModel: User = get_user_model()  # type: ignore
+
+    if (values := user_cache.get(user_id)) is MISSING:
+        if USER_CACHE_SHARED:
+            values = cache.get(_get_shared_user_cache_key(user_id), MISSING)
+
+        if values is MISSING:
+            values = UserModel.objects.values_list(*_get_user_snapshot_fields()).get(id=user_id)
+
+            if USER_CACHE_SHARED and USER_CACHE_TTL:
+                cache.set(_get_shared_user_cache_key(user_id), values, timeout=USER_CACHE_TTL)
+
+        _store_user_snapshot(user_id, values)
+
+    return _build_user(values)
+
+
+async def _aget_user_by_id(user_id: Any) -> User:
+    """
+    Function returns User instance by id async.
+
+    Concurrent lookups of the same user are deduplicated, so burst of requests costs one query.
+
+    """
+    if (values := user_cache.get(user_id)) is MISSING:
+        if (lookup := _user_lookups.get(user_id)) is None:
+            lookup = asyncio.ensure_future(_afetch_user_snapshot(user_id))
+            _user_lookups[user_id] = lookup
+            lookup.add_done_callback(lambda _: _user_lookups.pop(user_id, None))
+
+        values = await asyncio.shield(lookup)
+
+    return _build_user(values)
+
+
+async def _afetch_user_snapshot(user_id: Any) -> tuple:
+    UserModel: User = get_user_model()  # type: ignore
+
+    values = MISSING
+    if USER_CACHE_SHARED:
+        values = await cache.aget(_get_shared_user_cache_key(user_id), MISSING)
+
+    if values is MISSING:
+        values = await UserModel.objects.values_list(*_get_user_snapshot_fields()).aget(id=user_id)
+
+        if USER_CACHE_SHARED and USER_CACHE_TTL:
+            await cache.aset(_get_shared_user_cache_key(user_id), values, timeout=USER_CACHE_TTL)
+
+    _store_user_snapshot(user_id, values)
+    return values
+
+
+def _invalidate_user_cache(sender, instance: User, **kwargs) -> None:
+    """
+    Signal handler drops changed user from user cache.
+
     """
-    Function set context_user context variable by request token.
+    user_cache.delete(instance.pk)
+
+    if USER_CACHE_SHARED:
+        cache.delete(_get_shared_user_cache_key(instance.pk))
+
+
+post_save.connect(_invalidate_user_cache, sender=get_user_model(), dispatch_uid="fango_user_cache_save")
+post_delete.connect(_invalidate_user_cache, sender=get_user_model(), dispatch_uid="fango_user_cache_delete")
+
+
+async def set_context_user(request: Request, claims_only: bool = False) -> None:
+    """
+    Function set context_user context variable by request token,
+    and context_request variable for permission checks without request argument.
+
+    With claims_only ClaimsUser is set, and user query is skipped.
 
     """
-    context_user.set(await get_user_async(request))
+    context_request.set(request)
+
+    if claims_only:
+        access_token = request.headers.get("Authorization")
+        context_user.set(ClaimsUser(decode_token(access_token)) if access_token else None)
+    else:
+        context_user.set(await get_user_async(request))
 
 
 async def register_user(email: str, password: str) -> User:
@@ -106,4 +289,7 @@ def create_access_token(user: User) -> str:
         "user_id": user.pk,
         "token_type": "access",
     }
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    for claim in getattr(settings, "JWT_USER_CLAIMS", ()):
+        to_encode[claim] = getattr(user, claim)
+
+    return get_key_registry().encode(to_encode)
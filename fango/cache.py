@@ -0,0 +1,237 @@
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Hashable
+
+from django.core.cache import cache
+
+__all__ = ["MISSING", "LRUCache", "cached", "acached"]
+
+MISSING = object()
+
+
+class LRUCache:
+    """
+    Bounded in-process LRU cache with per-entry expiration.
+
+    Thread safe, because sync code of fango is running in thread pool.
+
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[Hashable, tuple[Any, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = MISSING, count: bool = True) -> Any:
+        """
+        Method returns cached value or default, expired entries are dropped.
+
+        """
+        with self._lock:
+            try:
+                value, expires_at = self._data[key]
+            except KeyError:
+                self.misses += count
+                return default
+
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                self.misses += count
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += count
+            return value
+
+    def set(self, key: Hashable, value: Any, expires_at: float | None = None) -> None:
+        """
+        Method stores value until expires_at unix timestamp, None means no expiration.
+
+        """
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Method returns cache counters.
+
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+
+def _make_key(args: tuple, kwargs: dict) -> Hashable:
+    return (args, frozenset(kwargs.items())) if kwargs else args
+
+
+def _make_shared_key(func: Callable, key: Hashable) -> str:
+    """
+    Function returns shared cache key, arguments must have stable repr between processes.
+
+    """
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()
+    return f"fango_cache_{func.__module__}.{func.__qualname__}_{digest}"
+
+
+class _CacheTiers:
+    """
+    Local LRU tier with optional shared django cache tier.
+
+    """
+
+    def __init__(self, func: Callable, ttl: float | None, maxsize: int, shared: bool) -> None:
+        self.func = func
+        self.ttl = ttl
+        self.shared = shared
+        self.local = LRUCache(maxsize=maxsize)
+        self.shared_hits = 0
+        self.shared_misses = 0
+
+    def expires_at(self) -> float | None:
+        return time.time() + self.ttl if self.ttl is not None else None
+
+    def get_shared(self, key: Hashable) -> Any:
+        value = cache.get(_make_shared_key(self.func, key), MISSING)
+        self._count_shared(value)
+        return value
+
+    async def aget_shared(self, key: Hashable) -> Any:
+        value = await cache.aget(_make_shared_key(self.func, key), MISSING)
+        self._count_shared(value)
+        return value
+
+    def _count_shared(self, value: Any) -> None:
+        if value is MISSING:
+            self.shared_misses += 1
+        else:
+            self.shared_hits += 1
+
+    def stats(self) -> dict[str, int]:
+        return {**self.local.stats(), "shared_hits": self.shared_hits, "shared_misses": self.shared_misses}
+
+    def clear(self) -> None:
+        self.local.clear()
+
+    def bind(self, wrapped: Callable) -> Callable:
+        wrapped.cache_stats = self.stats  # type: ignore
+        wrapped.cache_clear = self.clear  # type: ignore
+        return wrapped
+
+
+def cached(ttl: float | None = None, maxsize: int = 1024, shared: bool = False) -> Callable:
+    """
+    Decorator for two tier TTL caching of sync functions.
+
+    Results are stored in process LRU and optionally in django cache, falsy results are cached too.
+    Concurrent calls with the same arguments are computed once.
+
+    """
+
+    def decorator(func: Callable) -> Callable:
+        tiers = _CacheTiers(func, ttl, maxsize, shared)
+        locks: dict[Hashable, threading.Lock] = {}
+        locks_lock = threading.Lock()
+
+        @wraps(func)
+        def wrapped(*args, **kwargs) -> Any:
+            key = _make_key(args, kwargs)
+            if (result := tiers.local.get(key)) is not MISSING:
+                return result
+
+            with locks_lock:
+                lock = locks.setdefault(key, threading.Lock())
+
+            with lock:
+                try:
+                    if (result := tiers.local.get(key, count=False)) is not MISSING:
+                        return result
+
+                    if shared and (result := tiers.get_shared(key)) is not MISSING:
+                        tiers.local.set(key, result, expires_at=tiers.expires_at())
+                        return result
+
+                    result = func(*args, **kwargs)
+                    tiers.local.set(key, result, expires_at=tiers.expires_at())
+
+                    if shared:
+                        cache.set(_make_shared_key(func, key), result, timeout=ttl)
+
+                    return result
+                finally:
+                    with locks_lock:
+                        locks.pop(key, None)
+
+        return tiers.bind(wrapped)
+
+    return decorator
+
+
+def acached(ttl: float | None = None, maxsize: int = 1024, shared: bool = False) -> Callable:
+    """
+    Decorator for two tier TTL caching of coroutine functions.
+
+    Concurrent awaits with the same arguments share one call.
+
+    """
+
+    def decorator(func: Callable) -> Callable:
+        tiers = _CacheTiers(func, ttl, maxsize, shared)
+        calls: dict[Hashable, asyncio.Future] = {}
+
+        async def call(key: Hashable, args: tuple, kwargs: dict) -> Any:
+            if shared and (result := await tiers.aget_shared(key)) is not MISSING:
+                tiers.local.set(key, result, expires_at=tiers.expires_at())
+                return result
+
+            result = await func(*args, **kwargs)
+            tiers.local.set(key, result, expires_at=tiers.expires_at())
+
+            if shared:
+                await cache.aset(_make_shared_key(func, key), result, timeout=ttl)
+
+            return result
+
+        @wraps(func)
+        async def wrapped(*args, **kwargs) -> Any:
+            key = _make_key(args, kwargs)
+            if (result := tiers.local.get(key)) is not MISSING:
+                return result
+
+            if (future := calls.get(key)) is None:
+                future = asyncio.ensure_future(call(key, args, kwargs))
+                calls[key] = future
+                future.add_done_callback(lambda _: calls.pop(key, None))
+
+            return await asyncio.shield(future)
+
+        return tiers.bind(wrapped)
+
+    return decorator
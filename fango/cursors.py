@@ -0,0 +1,203 @@
+import hashlib
+import hmac
+import struct
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from fango.schemas import Cursor
+
+__all__ = ["CursorError", "encode_cursor", "decode_cursor"]
+
+VERSION = 1
+SIGNATURE_SIZE = 8
+EPOCH = datetime(1970, 1, 1)
+
+NONE, INT, STR, DATETIME, DATE, UUID_, DECIMAL, FLOAT, TRUE, FALSE = range(10)
+
+
+class CursorError(ValueError):
+    pass
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    while value > 0x7F:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _write_signed(buffer: bytearray, value: int) -> None:
+    _write_varint(buffer, value << 1 if value >= 0 else (-value << 1) - 1)
+
+
+def _write_bytes(buffer: bytearray, value: bytes) -> None:
+    _write_varint(buffer, len(value))
+    buffer += value
+
+
+def _write_value(buffer: bytearray, value: Any) -> None:
+    """
+    Function writes tagged value, unknown types are written as str.
+
+    """
+    if value is None:
+        buffer.append(NONE)
+
+    elif isinstance(value, bool):
+        buffer.append(TRUE if value else FALSE)
+
+    elif isinstance(value, int):
+        buffer.append(INT)
+        _write_signed(buffer, value)
+
+    elif isinstance(value, datetime):
+        aware = value.tzinfo is not None
+        if aware:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+
+        buffer.append(DATETIME)
+        buffer.append(aware)
+        _write_signed(buffer, (value - EPOCH) // timedelta(microseconds=1))
+
+    elif isinstance(value, date):
+        buffer.append(DATE)
+        _write_signed(buffer, value.toordinal())
+
+    elif isinstance(value, UUID):
+        buffer.append(UUID_)
+        buffer += value.bytes
+
+    elif isinstance(value, Decimal):
+        buffer.append(DECIMAL)
+        _write_bytes(buffer, str(value).encode())
+
+    elif isinstance(value, float):
+        buffer.append(FLOAT)
+        buffer += struct.pack(">d", value)
+
+    else:
+        buffer.append(STR)
+        _write_bytes(buffer, str(value).encode())
+
+
+class _Reader:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.pos = 0
+
+    def read(self, size: int) -> bytes:
+        if self.pos + size > len(self.data):
+            raise CursorError("Unexpected end of cursor.")
+
+        chunk = self.data[self.pos : self.pos + size]  # noqa: E203
+        self.pos += size
+        return chunk
+
+    def read_varint(self) -> int:
+        result = shift = 0
+        while True:
+            byte = self.read(1)[0]
+            result |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return result
+            shift += 7
+
+    def read_signed(self) -> int:
+        value = self.read_varint()
+        return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+    def read_value(self) -> Any:
+        try:
+            return self._read_value()
+        except ArithmeticError as e:
+            # Bad DECIMAL payload or out of range DATETIME/DATE of hand-edited cursor.
+            raise CursorError("Invalid cursor value.") from e
+
+    def _read_value(self) -> Any:
+        tag = self.read(1)[0]
+
+        if tag == NONE:
+            return None
+        elif tag == TRUE:
+            return True
+        elif tag == FALSE:
+            return False
+        elif tag == INT:
+            return self.read_signed()
+        elif tag == DATETIME:
+            aware = self.read(1)[0]
+            value = EPOCH + timedelta(microseconds=self.read_signed())
+            return value.replace(tzinfo=timezone.utc) if aware else value
+        elif tag == DATE:
+            return date.fromordinal(self.read_signed())
+        elif tag == UUID_:
+            return UUID(bytes=self.read(16))
+        elif tag == DECIMAL:
+            return Decimal(self.read(self.read_varint()).decode())
+        elif tag == FLOAT:
+            return struct.unpack(">d", self.read(8))[0]
+        elif tag == STR:
+            return self.read(self.read_varint()).decode()
+
+        raise CursorError("Unknown cursor value type.")
+
+
+def _sign(data: bytes, key: str | bytes) -> bytes:
+    key = key.encode() if isinstance(key, str) else key
+    return hmac.new(key, data, hashlib.sha256).digest()[:SIGNATURE_SIZE]
+
+
+def encode_cursor(cursor: Cursor, key: str | bytes | None = None) -> str:
+    """
+    Function encodes cursor to compact url safe string, position values keep native types.
+    With key cursor is signed by truncated HMAC.
+
+    """
+    buffer = bytearray((VERSION, bool(cursor.reverse)))
+    _write_varint(buffer, cursor.offset)
+
+    position = cursor.position or ()
+    _write_varint(buffer, len(position) + (cursor.position is not None))
+    for value in position:
+        _write_value(buffer, value)
+
+    if key:
+        buffer += _sign(bytes(buffer), key)
+
+    return urlsafe_b64encode(bytes(buffer)).rstrip(b"=").decode()
+
+
+def decode_cursor(encoded: str, key: str | bytes | None = None) -> Cursor:
+    """
+    Function decodes cursor encoded by encode_cursor.
+
+    """
+    try:
+        data = urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+    except (ValueError, TypeError):
+        raise CursorError("Invalid cursor encoding.")
+
+    if key:
+        data, signature = data[:-SIGNATURE_SIZE], data[-SIGNATURE_SIZE:]
+        if not hmac.compare_digest(signature, _sign(data, key)):
+            raise CursorError("Invalid cursor signature.")
+
+    reader = _Reader(data)
+    if reader.read(1)[0] != VERSION:
+        raise CursorError("Unknown cursor version.")
+
+    reverse = reader.read(1)[0]
+    offset = reader.read_varint()
+
+    if size := reader.read_varint():
+        position = tuple(reader.read_value() for _ in range(size - 1))
+    else:
+        position = None
+
+    if reader.pos != len(data):
+        raise CursorError("Unexpected cursor data.")
+
+    return Cursor(offset=offset, reverse=bool(reverse), position=position)
@@ -1,6 +1,11 @@
-from typing import cast
+from typing import Any, Mapping, cast
 
-from django.db.models import Q
+from django.conf import settings
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Lookup, Model, Q, QuerySet, Value
+from django.db.models.expressions import Col, RawSQL
+from django.db.models.functions import Cast
+from django.db.models.sql.where import AND
 from django_filters import (
     BaseInFilter,
     BooleanFilter,
@@ -13,9 +18,21 @@ from django_filters import (
     TimeFilter,
     UUIDFilter,
 )
+from django_filters.constants import EMPTY_VALUES
 from pydantic import BaseModel
 
 from fango.adapters import types
+from fango.cache import MISSING, LRUCache
+from fango.log import logger
+
+FILTERSET_MAX_FILTERS = getattr(settings, "FILTERSET_MAX_FILTERS", 100)
+ARRAY_TRIGRAM_SEARCH = getattr(settings, "ARRAY_TRIGRAM_SEARCH", False)
+ARRAY_TO_TEXT_FUNCTION = "fango_array_to_text"
+SEARCH_CONFIG = getattr(settings, "SEARCH_CONFIG", "simple")
+SEARCH_RANK = "search_rank"
+
+_filtersets: dict[type[BaseModel], type[FilterSet]] = {}
+_filter_templates = LRUCache(maxsize=getattr(settings, "FILTER_TEMPLATES_CACHE_SIZE", 1024))
 
 
 class ArrayFilter(BaseInFilter, CharFilter):
@@ -31,27 +48,323 @@ class LimitedListFilter(Filter):
 
     NOTE: рекомендую отключить возможность делать такие лукапы для списков.
 
+    В PostgreSQL поиск идет по всем элементам массива через EXISTS и unnest.
+    С ARRAY_TRIGRAM_SEARCH добавляется предфильтр, который использует GIN trigram индекс,
+    созданный миграцией из array_trigram_index_sql.
+
     """
 
     LOOKUP_ELEMENTS = 100
+    LIKE_PATTERNS = {"istartswith": "{}%", "iendswith": "%{}", "icontains": "%{}%"}
 
     def filter(self, qs, value):
         if value:
+            if (
+                connections[qs.db].vendor == "postgresql"
+                and self.lookup_expr in self.LIKE_PATTERNS
+                and "__" not in self.field_name
+            ):
+                return self._filter_postgresql(qs, value)
+
             query = Q(**{f"{self.field_name}__0__{self.lookup_expr}": value})
             for i in range(1, self.LOOKUP_ELEMENTS):
                 query |= Q(**{f"{self.field_name}__{i}__{self.lookup_expr}": value})
             qs = qs.filter(query)
         return qs
 
+    def _filter_postgresql(self, qs, value):
+        quote_name = connections[qs.db].ops.quote_name
+        column = "{}.{}".format(
+            quote_name(qs.model._meta.db_table), quote_name(qs.model._meta.get_field(self.field_name).column)
+        )
+        escaped = _escape_like(value)
+
+        qs = qs.filter(
+            RawSQL(
+                f"EXISTS (SELECT 1 FROM unnest({column}) AS element WHERE element::text ILIKE %s)",
+                [self.LIKE_PATTERNS[self.lookup_expr].format(escaped)],
+                output_field=BooleanField(),
+            )
+        )
+
+        if ARRAY_TRIGRAM_SEARCH:
+            qs = qs.filter(
+                RawSQL(
+                    f"{ARRAY_TO_TEXT_FUNCTION}({column}::text[]) ILIKE %s",
+                    [f"%{escaped}%"],
+                    output_field=BooleanField(),
+                )
+            )
+
+        return qs
+
+
+class SearchFilter(CharFilter):
+    """
+    Full-text search filter by search_fields, rows are annotated with search_rank.
+
+    PostgreSQL uses SearchVector and SearchQuery, it may be served by GIN index from search_index.
+    SQLite uses FTS5 table created by sqlite_search_table_sql, other databases use icontains.
+
+    """
+
+    def __init__(self, search_fields: tuple[str, ...], config: str = SEARCH_CONFIG, **kwargs) -> None:
+        super().__init__(field_name=search_fields[0], **kwargs)
+        self.search_fields = search_fields
+        self.config = config
+
+    def filter(self, qs, value):
+        if not value:
+            return qs
+
+        vendor = connections[qs.db].vendor
+
+        if vendor == "postgresql":
+            return self._filter_postgresql(qs, value)
+
+        elif vendor == "sqlite":
+            return self._filter_sqlite(qs, value)
+
+        query = Q()
+        for term in value.split():
+            term_query = Q()
+            for field_name in self.search_fields:
+                term_query |= Q(**{f"{field_name}__icontains": term})
+            query &= term_query
+
+        return qs.filter(query).annotate(**{SEARCH_RANK: Value(0.0, output_field=FloatField())})
+
+    def _filter_postgresql(self, qs, value):
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+        vector = SearchVector(*self.search_fields, config=self.config)
+        query = SearchQuery(value, config=self.config, search_type="websearch")
+
+        return (
+            qs.alias(search_vector=vector)
+            .filter(search_vector=query)
+            # ts_rank is real, it is cast to double precision to compare equal to cursor position.
+            .annotate(**{SEARCH_RANK: Cast(SearchRank(vector, query), FloatField())})
+        )
+
+    def _filter_sqlite(self, qs, value):
+        quote_name = connections[qs.db].ops.quote_name
+        table = quote_name(qs.model._meta.db_table)
+        fts_table = quote_name(_get_search_table_name(qs.model))
+        pk = f"{table}.{quote_name(qs.model._meta.pk.column)}"
+        match = " ".join('"{}"'.format(term.replace('"', '""')) for term in value.split())
+        matched = f"SELECT rowid, bm25({fts_table}) AS rank FROM {fts_table} WHERE {fts_table} MATCH %s"
+
+        return qs.filter(
+            RawSQL(f"{pk} IN (SELECT rowid FROM ({matched}))", [match], output_field=BooleanField())
+        ).annotate(
+            **{
+                SEARCH_RANK: RawSQL(
+                    f"(SELECT -rank FROM ({matched}) WHERE rowid = {pk})",
+                    [match],
+                    output_field=FloatField(),
+                )
+            }
+        )
+
+
+def _get_search_table_name(model: type[Model]) -> str:
+    return f"{model._meta.db_table}_fts"
+
+
+def search_index(fields: tuple[str, ...], name: str, config: str = SEARCH_CONFIG):
+    """
+    Function returns PostgreSQL GIN index for Meta.indexes, it serves SearchFilter with the same fields.
+
+    """
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    return GinIndex(SearchVector(*fields, config=config), name=name)
+
+
+def sqlite_search_table_sql(model: type[Model], fields: tuple[str, ...]) -> tuple[list[str], list[str]]:
+    """
+    Function returns forward and reverse SQL for migrations.RunSQL, it creates
+    SQLite FTS5 table for SearchFilter, synchronized with model table by triggers.
+
+    """
+    table = model._meta.db_table
+    fts_table = _get_search_table_name(model)
+    pk = model._meta.pk.column
+    columns = [model._meta.get_field(x).column for x in fields]
+
+    column_list = ", ".join(f'"{x}"' for x in columns)
+    new_values = ", ".join(f'new."{x}"' for x in columns)
+    old_values = ", ".join(f'old."{x}"' for x in columns)
+    delete = (
+        f'INSERT INTO "{fts_table}"("{fts_table}", rowid, {column_list}) '
+        f"VALUES ('delete', old.\"{pk}\", {old_values});"
+    )
+    insert = f'INSERT INTO "{fts_table}"(rowid, {column_list}) VALUES (new."{pk}", {new_values});'
+
+    forward = [
+        f'CREATE VIRTUAL TABLE "{fts_table}" USING fts5({column_list}, content="{table}", content_rowid="{pk}")',
+        f'CREATE TRIGGER "{fts_table}_ai" AFTER INSERT ON "{table}" BEGIN {insert} END',
+        f'CREATE TRIGGER "{fts_table}_ad" AFTER DELETE ON "{table}" BEGIN {delete} END',
+        f'CREATE TRIGGER "{fts_table}_au" AFTER UPDATE ON "{table}" BEGIN {delete} {insert} END',
+        f'INSERT INTO "{fts_table}"("{fts_table}") VALUES (\'rebuild\')',
+    ]
+    reverse = [f'DROP TABLE IF EXISTS "{fts_table}"']
+    return forward, reverse
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def array_trigram_index_sql(model: type[Model], field_name: str) -> tuple[list[str], list[str]]:
+    """
+    Function returns forward and reverse SQL for migrations.RunSQL, it creates
+    GIN trigram index for array field used by LimitedListFilter with ARRAY_TRIGRAM_SEARCH.
+    Array is cast to text[] like in the filter, so non-text arrays are indexed too.
+
+    """
+    table = model._meta.db_table
+    column = model._meta.get_field(field_name).column
+    index_name = f"{table}_{column}_trgm"[:63]
+
+    forward = [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        f"CREATE OR REPLACE FUNCTION {ARRAY_TO_TEXT_FUNCTION}(text[]) RETURNS text "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$ SELECT array_to_string($1, chr(31)) $$",
+        f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{table}" '
+        f'USING gin ({ARRAY_TO_TEXT_FUNCTION}("{column}"::text[]) gin_trgm_ops)',
+    ]
+    reverse = [f'DROP INDEX IF EXISTS "{index_name}"']
+    return forward, reverse
+
 
 def generate_filterset_by_pydantic(schema: BaseModel) -> type[FilterSet]:
     """
     Function generates django-filters FilterSet, based on pydantic schema fields.
 
+    FilterSet is generated once per schema and shared by all viewsets.
+
+    """
+    if (filterset := _filtersets.get(schema)) is None:  # type: ignore
+        filterset = _filtersets[schema] = _build_filterset(schema)  # type: ignore
+        count = len(filterset.base_filters)
+
+        if count > FILTERSET_MAX_FILTERS:
+            logger.warning(f"[filters] {schema.__name__} generates {count} filters.")
+        elif getattr(settings, "FILTERSET_REPORT", False):
+            logger.info(f"[filters] {schema.__name__} generates {count} filters.")
+
+    return filterset
+
+
+def get_filterset_report() -> dict[str, int]:
+    """
+    Function returns generated filters count by schema, sorted by count.
+
+    """
+    report = {schema.__name__: len(filterset.base_filters) for schema, filterset in _filtersets.items()}
+    return dict(sorted(report.items(), key=lambda x: x[1], reverse=True))
+
+
+# Generated filter classes, which filter by a single lookup with unchanged value.
+TEMPLATE_FILTER_CLASSES = frozenset(
+    {
+        ArrayFilter,
+        BooleanFilter,
+        CharFilter,
+        DateFilter,
+        DateTimeFilter,
+        NumberFilter,
+        TimeFilter,
+        UUIDFilter,
+    }
+)
+
+
+def apply_filterset(filterset_class: type[FilterSet], data: Mapping, queryset: QuerySet) -> QuerySet:
+    """
+    Function applies filterset to queryset like FilterSet.qs.
+
+    Lookups are resolved once per filterset, model and shape of parameter names,
+    then only parameter values are bound to cached lookups. Shapes with filters,
+    which are not a single lookup on base table, or with method and custom filters,
+    which may change value, are applied by filterset.
+
+    """
+    filterset = filterset_class(data, queryset=queryset)
+
+    if filterset_class.filter_queryset is not FilterSet.filter_queryset or not filterset.form.is_valid():
+        return filterset.qs
+
+    model = queryset.model
+    if queryset.query.alias_map and queryset.query.base_table != model._meta.db_table:
+        return filterset.qs
+
+    values = {name: value for name, value in filterset.form.cleaned_data.items() if value not in EMPTY_VALUES}
+    if not values:
+        return queryset.all()
+
+    key = (filterset_class, model, tuple(values))
+    if (template := _filter_templates.get(key)) is MISSING:
+        template = _compile_filter_template(filterset, model, values)
+        _filter_templates.set(key, template)
+
+    if template is None:
+        return filterset.qs
+
+    queryset = queryset.all()
+    for name, value in values.items():
+        lookup_class, lhs = template[name]
+        queryset.query.where.add(lookup_class(lhs, value), AND)
+
+    return queryset
+
+
+def _compile_filter_template(
+    filterset: FilterSet, model: type[Model], values: dict[str, Any]
+) -> dict[str, tuple[type[Lookup], Col]] | None:
     """
-    attrs = {}
+    Function applies filters one by one to empty queryset, and returns lookup class
+    and column of each filter, or None if any filter can't be rebound.
+
+    """
+    queryset = model._base_manager.all()
+    template = {}
+
+    for name, value in values.items():
+        filter_instance = filterset.filters[name]
+        if type(filter_instance) not in TEMPLATE_FILTER_CLASSES or filter_instance.method is not None:
+            return None
+
+        before = len(queryset.query.where.children)
+        queryset = filter_instance.filter(queryset, value)
+        added = queryset.query.where.children[before:]
+
+        if (
+            len(added) != 1
+            or not isinstance(added[0], Lookup)
+            or not isinstance(added[0].lhs, Col)
+            or added[0].lhs.alias != model._meta.db_table
+            or len(queryset.query.alias_map) > 1
+            or queryset.query.annotations
+            or queryset.query.distinct
+        ):
+            return None
+
+        template[name] = (type(added[0]), added[0].lhs)
+
+    return template
+
+
+def _build_filterset(schema: BaseModel) -> type[FilterSet]:
+    attrs, search_fields = {}, []
 
     for field_name, field in schema.model_fields.items():
+        if types.is_searchable(field):
+            search_fields.append(field_name)
+
         if types.is_bool(field):
             attrs[field_name] = BooleanFilter(field_name=field_name)
 
@@ -98,4 +411,7 @@ def generate_filterset_by_pydantic(schema: BaseModel) -> type[FilterSet]:
             attrs[field_name + "_starts"] = CharFilter(field_name=field_name, lookup_expr="istartswith")
             attrs[field_name + "_ends"] = CharFilter(field_name=field_name, lookup_expr="iendswith")
 
+    if search_fields:
+        attrs["search"] = SearchFilter(search_fields=tuple(search_fields))
+
     return cast(type[FilterSet], type(f"{schema.__name__}FilterSet", (FilterSet,), attrs))
@@ -0,0 +1,46 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from fango.advisor import get_index_report
+from fango.routing import FangoRouter
+
+
+class Command(BaseCommand):
+    """
+    Command prints generated filters without serving index, used filters go first.
+
+    Routers are registered on import of modules from FANGO_ROUTER_MODULES setting or --module option.
+
+    """
+
+    help = "Report missing indexes for generated filtersets."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--module", action="append", default=[], help="Module with registered viewsets.")
+        parser.add_argument("--all", action="store_true", help="Show filters with indexes too.")
+
+    def handle(self, *args, **options):
+        for module in [*getattr(settings, "FANGO_ROUTER_MODULES", ()), *options["module"]]:
+            import_module(module)
+
+        for viewset in FangoRouter.viewsets:
+            model = viewset.queryset.model
+            report = get_index_report(model, viewset.filterset_class)
+
+            if not options["all"]:
+                report = [x for x in report if not x["has_index"]]
+
+            if not report:
+                continue
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{viewset._basename} ({model._meta.label}):"))
+
+            for row in sorted(report, key=lambda x: x["used"], reverse=True):
+                status = "ok" if row["has_index"] else f"missing {row['required_index']} index"
+                avg = f"{row['avg_ms']}ms" if row["avg_ms"] is not None else "-"
+                self.stdout.write(
+                    f"  {row['filter']:<30} {row['column']}__{row['lookup']:<15} "
+                    f"used={row['used']:<6} avg={avg:<10} {status}"
+                )
@@ -1,52 +1,125 @@
+import hashlib
+import json
+import math
 import typing
-from base64 import b64decode, b64encode
-from urllib.parse import parse_qsl, urlencode
 
 if typing.TYPE_CHECKING:
     from django.db.models import Model, QuerySet
     from fastapi import Request
 
-from typing import TypeVar
+from typing import Any, TypeVar
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import Q
 from fastapi import HTTPException
 
+from fango import cursors
 from fango.schemas import Cursor, Page
 from fango.utils import replace_proto, reverse_ordering
 
 T = TypeVar("T")
 
+COUNT_EXACT = "exact"
+COUNT_CACHED = "cached"
+COUNT_ESTIMATE = "estimate"
+
 
 class CursorPagination:
     """
     DRF like cursor pagination class.
 
+    Cursors keep native types of ordering values, and are signed
+    with signing_key if it is set.
+
+    With count_mode page has total count: exact, cached for count_cache_ttl
+    or estimated by database planner.
+
     """
 
-    def __init__(self, request: "Request", page_size: int, ordering: tuple[str, ...]) -> None:
+    count_cache_ttl: int = getattr(settings, "PAGE_COUNT_CACHE_TTL", 60)
+
+    signing_key: str | bytes | None = getattr(settings, "CURSOR_SIGNING_KEY", None)
+
+    def __init__(
+        self,
+        request: "Request",
+        page_size: int,
+        ordering: tuple[str, ...],
+        values: tuple[str, ...] | None = None,
+        count_mode: str | None = None,
+    ) -> None:
         self.request = request
         self.page_size = page_size
         self.ordering = ordering
+        self.values = values
+        self.count_mode = count_mode
+        self.count: int | None = None
         self.cursor = self.decode_cursor()
 
-    def get_page(self, queryset: "QuerySet") -> list["Model"]:
+    def get_page(self, queryset: "QuerySet") -> list["Model | dict"]:
+        results = list(self._get_page_queryset(queryset))
+        return self._process_results(results)
+
+    async def aget_page(self, queryset: "QuerySet") -> list["Model | dict"]:
+        """
+        Method is async version of get_page, it uses async ORM iteration.
+
+        """
+        results = [item async for item in self._get_page_queryset(queryset)]
+        return self._process_results(results)
+
+    async def aget_count(self, queryset: "QuerySet") -> int | None:
+        """
+        Method returns total count of queryset by count_mode.
+
+        """
+        queryset = queryset.order_by()
+
+        if self.count_mode == COUNT_EXACT:
+            self.count = await queryset.acount()
+
+        elif self.count_mode == COUNT_CACHED:
+            try:
+                sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+            except EmptyResultSet:
+                self.count = 0
+                return self.count
+
+            digest = hashlib.sha1(repr((queryset.db, sql, params)).encode()).hexdigest()
+            key = f"fango_page_count_{queryset.model._meta.label_lower}_{digest}"
+
+            if (count := await cache.aget(key)) is None:
+                count = await queryset.acount()
+                await cache.aset(key, count, timeout=self.count_cache_ttl)
+
+            self.count = count
+
+        elif self.count_mode == COUNT_ESTIMATE:
+            self.count = await sync_to_async(_estimate_count)(queryset)
+
+        return self.count
+
+    def _get_page_queryset(self, queryset: "QuerySet") -> "QuerySet":
         if self.cursor.reverse:
             queryset = queryset.order_by(*reverse_ordering(self.ordering))
         else:
             queryset = queryset.order_by(*self.ordering)
 
         if self.cursor.position is not None:
-            order = self.ordering[0]
-            is_reversed = order.startswith("-")
-            order_attr = order.lstrip("-")
+            nulls_largest = connections[queryset.db].features.nulls_order_largest
+            queryset = queryset.filter(self._get_keyset_filter(self.cursor.position, nulls_largest))
 
-            if self.cursor.reverse != is_reversed:
-                kwargs = {order_attr + "__lt": self.cursor.position}
-            else:
-                kwargs = {order_attr + "__gt": self.cursor.position}
+        if self.values is not None:
+            ordering_fields = [order.lstrip("-") for order in self.ordering]
+            queryset = queryset.values(*self.values, *(x for x in ordering_fields if x not in self.values))
 
-            queryset = queryset.filter(**kwargs)
+        return queryset[self.cursor.offset : self.cursor.offset + self.page_size + 1]  # noqa: E203
 
-        results = list(queryset[self.cursor.offset : self.cursor.offset + self.page_size + 1])  # noqa: E203
+    def _process_results(self, results: list) -> list["Model | dict"]:
         self.page = list(results[: self.page_size])
 
         if len(results) > len(self.page):
@@ -75,6 +148,50 @@ class CursorPagination:
 
         return self.page
 
+    def _get_keyset_filter(self, position: tuple, nulls_largest: bool = False) -> Q:
+        """
+        Method returns keyset filter over all ordering fields, like (a, b) > (x, y) expanded
+        to a > x OR (a = x AND b > y), with a >= x bound for index range scan.
+
+        NULL values are compared with isnull lookups by database NULL ordering,
+        nulls_largest means NULLs go last in ascending order, like in PostgreSQL.
+
+        """
+        query, equal, bound, is_empty = Q(), Q(), None, True
+
+        for index, (order, value) in enumerate(zip(self.ordering, position)):
+            order_attr = order.lstrip("-")
+
+            if self.cursor.reverse != order.startswith("-"):
+                lookup = "__lt"
+            else:
+                lookup = "__gt"
+
+            nulls_following = (lookup == "__gt") == nulls_largest
+
+            if value is None:
+                following = None if nulls_following else Q(**{order_attr + "__isnull": False})
+                current = Q(**{order_attr + "__isnull": True})
+            else:
+                following = Q(**{order_attr + lookup: value})
+                if nulls_following:
+                    following |= Q(**{order_attr + "__isnull": True})
+                current = Q(**{order_attr: value})
+
+                if index == 0 and not nulls_following:
+                    bound = Q(**{order_attr + lookup + "e": value})
+
+            if following is not None:
+                query |= equal & following
+                is_empty = False
+
+            equal &= current
+
+        if is_empty:
+            return Q(pk__in=[])
+
+        return bound & query if bound is not None and len(position) > 1 else query
+
     def get_next_link(self) -> str | None:
         if not self.has_next:
             return None
@@ -150,40 +267,67 @@ class CursorPagination:
         return self.encode_cursor(Cursor(offset=offset, reverse=True, position=position))
 
     def decode_cursor(self) -> Cursor:
+        if not (encoded_cursor := self.request.query_params.get("cursor")):
+            return Cursor(offset=0, reverse=False, position=None)
+
         try:
-            encoded_cursor = self.request.query_params.get("cursor", "")
-            tokens = dict(parse_qsl(b64decode(encoded_cursor.encode()).decode()))
-            offset = int(tokens.get("o", 0))
-            reverse = bool(int(tokens.get("r", 0)))
-            position = tokens.get("p")
-            return Cursor(offset=offset, reverse=reverse, position=position)
+            return cursors.decode_cursor(encoded_cursor, self.signing_key)
         except (TypeError, ValueError):
             raise HTTPException(status_code=500, detail="Invalid cursor.")
 
     def encode_cursor(self, cursor: Cursor) -> str:
-        tokens = {}
-        if cursor.offset:
-            tokens["o"] = cursor.offset
-        if cursor.reverse:
-            tokens["r"] = 1
-        if cursor.position is not None:
-            tokens["p"] = cursor.position
-
-        querystring = urlencode(tokens, doseq=True)
-        encoded = b64encode(querystring.encode()).decode()
+        encoded = cursors.encode_cursor(cursor, self.signing_key)
         return str(self.request.url.include_query_params(cursor=encoded))
 
-    def _get_position_from_instance(self, instance: "dict | Model", ordering: tuple[str, ...]) -> str:
-        field_name = ordering[0].lstrip("-")
+    def _get_position_from_instance(self, instance: "dict | Model", ordering: tuple[str, ...]) -> tuple[Any, ...]:
+        field_names = [order.lstrip("-") for order in ordering]
         if isinstance(instance, dict):
-            attr = instance[field_name]
+            return tuple(instance[field_name] for field_name in field_names)
         else:
-            attr = getattr(instance, field_name)
-        return str(attr)
+            return tuple(getattr(instance, field_name) for field_name in field_names)
 
     def get_page_response(self, data) -> Page:
+        extra = {}
+        if self.count is not None:
+            extra = {"count": self.count, "pages": math.ceil(self.count / self.page_size)}
+
         return Page(
             next=replace_proto(self.get_next_link()),
             previous=replace_proto(self.get_previous_link()),
             results=data,
+            **extra,
         )
+
+
+def _estimate_count(queryset: "QuerySet") -> int:
+    """
+    Function returns PostgreSQL planner estimate of queryset rows,
+    table reltuples is used for unfiltered queryset. Other databases use exact count.
+
+    """
+    connection = connections[queryset.db]
+
+    if connection.vendor != "postgresql":
+        return queryset.count()
+
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            if (row := cursor.fetchone()) and row[0] >= 0:
+                return row[0]
+
+        try:
+            sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+        except EmptyResultSet:
+            return 0
+
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
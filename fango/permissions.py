@@ -1,23 +1,72 @@
 import inspect
+import time
 from types import FunctionType, MethodType
-from typing import get_args
-
-from django.contrib.auth.models import User
-from django.db.models import Model
+from typing import Any, Callable, get_args
+from uuid import uuid4
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.db.models import Exists, Model, Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.utils.translation import gettext as _
 from fastapi import HTTPException, Request
 
 from fango.auth import context_user, set_context_user
+from fango.cache import MISSING, LRUCache
 from fango.routing import oauth2_scheme
-from fango.utils import run_async, ttl_cache
 
 __all__ = [
     "PermissionDependency",
     "ModelPermissions",
+    "ObjectPermissions",
     "IsAuthenticated",
     "AllowAny",
+    "register_permission_plan",
+    "aload_user_permissions",
 ]
 
+DEFAULT_PERMISSIONS_MAPPING = {
+    "GET": ["%(app_label)s.view_%(model_name)s"],
+    "OPTIONS": ["%(app_label)s.view_%(model_name)s"],
+    "HEAD": ["%(app_label)s.view_%(model_name)s"],
+    "POST": ["%(app_label)s.add_%(model_name)s"],
+    "PUT": ["%(app_label)s.change_%(model_name)s"],
+    "PATCH": ["%(app_label)s.change_%(model_name)s"],
+    "DELETE": ["%(app_label)s.delete_%(model_name)s"],
+}
+
+_permission_plans: dict[tuple[Callable, str], frozenset[str] | None] = {}
+
+LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def _get_permissions_cache_ttl() -> int:
+    """
+    Function returns PERMISSIONS_CACHE_TTL setting or default TTL.
+
+    Permission versions are seen by all workers only with shared default cache,
+    with per process backend default TTL is short, like before versioning.
+
+    """
+    if (ttl := getattr(settings, "PERMISSIONS_CACHE_TTL", None)) is not None:
+        return ttl
+
+    if settings.CACHES["default"]["BACKEND"] in LOCAL_CACHE_BACKENDS:
+        return 10
+
+    return 6 * 60 * 60
+
+
+PERMISSIONS_CACHE_TTL = _get_permissions_cache_ttl()
+GROUPS_PERMISSIONS_VERSION_KEY = "fango_permissions_version_groups"
+
+permissions_cache = LRUCache(maxsize=getattr(settings, "PERMISSIONS_CACHE_SIZE", 1024))
+
 
 class PermissionException(Exception):
     def __init__(self):
@@ -37,12 +86,21 @@ class PermissionDependency:
     def __lt__(cls, permission: "PermissionDependency") -> bool:
         return cls.priority < permission.priority
 
+    @classmethod
+    def get_queryset_filter(cls, request: Request) -> Q:
+        """
+        Method returns filter of rows allowed for request, it is applied to viewset queryset.
+
+        """
+        return Q()
+
 
 class ModelPermissions(PermissionDependency):
     """
     Permission for checking django model permissions.
 
     It may be parametrized with model class, useful for @action.
+    User permissions are loaded by load_permissions, override it for custom auth backends.
 
     """
 
@@ -51,25 +109,53 @@ class ModelPermissions(PermissionDependency):
     def __init__(self, model: type[Model] | None = None) -> None:
         self.model: type[Model] | None = model
 
+    @classmethod
+    async def load_permissions(cls, user: User) -> set[str]:
+        return await aload_user_permissions(user)
+
     @classmethod
     async def dependency(cls, request: Request) -> None:
         await oauth2_scheme(request)
         await set_context_user(request)
-        await _check_model_permissions(request)
+        await _check_model_permissions(request, loader=cls.load_permissions)
+
+
+class ObjectPermissions(ModelPermissions):
+    """
+    Permission for checking django model permissions and limiting rows by owner.
+
+    owner_field is a lookup to user, like "author" or "project__members".
+    Visibility is enforced in SQL by AsyncGenericViewSet.get_queryset,
+    CRUDMixin.update_entry and delete_entry check entry by it too.
+
+    Priority is between ModelPermissions and IsAuthenticated: with ModelPermissions on the same route
+    ObjectPermissions is applied, IsAuthenticated or AllowAny still relaxes the route.
+
+    """
+
+    priority = 1.5
+    owner_field = "user"
+
+    @classmethod
+    def get_queryset_filter(cls, request: Request) -> Q:
+        return Q(**{cls.owner_field: context_user.get().pk})
 
 
 class IsAuthenticated(PermissionDependency):
     """
     Permission for allowing all authenticated requests.
 
+    Set claims_only to put ClaimsUser in context_user without user query.
+
     """
 
     priority = 2
+    claims_only = False
 
     @classmethod
     async def dependency(cls, request: Request) -> None:
         await oauth2_scheme(request)
-        await set_context_user(request)
+        await set_context_user(request, claims_only=cls.claims_only)
 
 
 class AllowAny(PermissionDependency):
@@ -85,14 +171,142 @@ class AllowAny(PermissionDependency):
         pass
 
 
-@ttl_cache(10)
-def _get_user_permissions(user: User) -> set[str]:
+async def aload_user_permissions(user: User) -> set[str]:
+    """
+    Function loads user and groups permissions with one async query,
+    it follows ModelBackend rules for active and superusers.
+
+    """
+    UserModel = get_user_model()
+    user_query = UserModel.objects.filter(pk=user.pk)
+    query, conditions = Q(), []
+
+    if hasattr(UserModel, "user_permissions"):
+        query |= Q(**{UserModel._meta.get_field("user_permissions").related_query_name(): user.pk})
+
+    if hasattr(UserModel, "groups"):
+        query |= Q(**{"group__%s" % UserModel._meta.get_field("groups").related_query_name(): user.pk})
+
+    if hasattr(UserModel, "is_superuser"):
+        query |= Exists(user_query.filter(is_superuser=True))
+
+    if hasattr(UserModel, "is_active"):
+        conditions.append(Exists(user_query.filter(is_active=True)))
+
+    if not query:
+        return set()
+
+    permissions = (
+        Permission.objects.filter(query, *conditions)
+        .values_list("content_type__app_label", "codename")
+        .distinct()
+        .order_by()
+    )
+    return {f"{app_label}.{codename}" async for app_label, codename in permissions}
+
+
+def _get_permissions_version_key(user_id: Any) -> str:
+    return f"fango_permissions_version_{user_id}"
+
+
+async def _aget_permissions_versions(user_id: Any) -> tuple[str, str]:
+    """
+    Function returns user and groups permission versions from django cache,
+    missing versions are initialized with new value.
+
+    """
+    keys = [_get_permissions_version_key(user_id), GROUPS_PERMISSIONS_VERSION_KEY]
+    versions = await cache.aget_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, uuid4().hex, timeout=None)
+            versions[key] = await cache.aget(key)
+
+    return versions[keys[0]], versions[keys[1]]
+
+
+async def _aget_cached_user_permissions(user: User, loader: Callable) -> set[str]:
+    """
+    Function returns user permissions cached by user id and permission versions.
+
+    Versions are bumped by signals, so changes made by QuerySet.update() or raw SQL
+    are seen after PERMISSIONS_CACHE_TTL only.
+
+    """
+    key = (user.pk, *await _aget_permissions_versions(user.pk))
+
+    if (permissions := permissions_cache.get(key)) is MISSING:
+        permissions = await loader(user)
+        permissions_cache.set(key, permissions, expires_at=time.time() + PERMISSIONS_CACHE_TTL)
+
+    return permissions
+
+
+def _bump_permissions_version(key: str) -> None:
+    cache.set(key, uuid4().hex, timeout=None)
+
+
+def _invalidate_user_permissions(sender, instance: Model, action: str, reverse: bool, pk_set: set | None, **kwargs):
+    """
+    Signal handler for user_permissions and groups m2m changes.
+
+    """
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        _bump_permissions_version(_get_permissions_version_key(instance.pk))
+
+    elif pk_set is None:
+        _bump_permissions_version(GROUPS_PERMISSIONS_VERSION_KEY)
+
+    else:
+        for pk in pk_set:
+            _bump_permissions_version(_get_permissions_version_key(pk))
+
+
+def _invalidate_groups_permissions(sender, action: str = "post_delete", **kwargs) -> None:
+    """
+    Signal handler for Group.permissions changes, it invalidates permissions of all users.
+
+    """
+    if action in ("post_add", "post_remove", "post_clear", "post_delete"):
+        _bump_permissions_version(GROUPS_PERMISSIONS_VERSION_KEY)
+
+
+def _invalidate_user(sender, instance: Model, **kwargs) -> None:
+    """
+    Signal handler for user changes, like is_active or is_superuser.
+
     """
-    Function call user.get_all_permissions() in async context
-    and caching to 10s.
+    _bump_permissions_version(_get_permissions_version_key(instance.pk))
+
 
+def _connect_permissions_signals() -> None:
     """
-    return user.get_all_permissions()
+    Function connects signals, which invalidate cached permissions.
+
+    """
+    UserModel = get_user_model()
+
+    post_save.connect(_invalidate_user, sender=UserModel, dispatch_uid="fango_permissions_user_save")
+    post_delete.connect(_invalidate_user, sender=UserModel, dispatch_uid="fango_permissions_user_delete")
+    post_delete.connect(_invalidate_groups_permissions, sender=Group, dispatch_uid="fango_permissions_group_delete")
+    m2m_changed.connect(
+        _invalidate_groups_permissions, sender=Group.permissions.through, dispatch_uid="fango_permissions_group"
+    )
+
+    for field_name in ("user_permissions", "groups"):
+        if hasattr(UserModel, field_name):
+            m2m_changed.connect(
+                _invalidate_user_permissions,
+                sender=getattr(UserModel, field_name).through,
+                dispatch_uid=f"fango_permissions_{field_name}",
+            )
+
+
+_connect_permissions_signals()
 
 
 def _get_permissions_mapping(request: Request):
@@ -100,19 +314,31 @@ def _get_permissions_mapping(request: Request):
     Function for checking stored permission_mapping, or return default.
 
     """
-    if state_stored := hasattr(request.state, "permissions_mapping"):
-        assert isinstance(state_stored, list)
+    if (state_stored := getattr(request.state, "permissions_mapping", None)) is not None:
         return state_stored
 
-    return {
-        "GET": ["%(app_label)s.view_%(model_name)s"],
-        "OPTIONS": ["%(app_label)s.view_%(model_name)s"],
-        "HEAD": ["%(app_label)s.view_%(model_name)s"],
-        "POST": ["%(app_label)s.add_%(model_name)s"],
-        "PUT": ["%(app_label)s.change_%(model_name)s"],
-        "PATCH": ["%(app_label)s.change_%(model_name)s"],
-        "DELETE": ["%(app_label)s.delete_%(model_name)s"],
-    }
+    return DEFAULT_PERMISSIONS_MAPPING
+
+
+def _get_required_permissions(mapping: dict, method: str, model: type[Model]) -> frozenset[str] | None:
+    """
+    Function returns permission codenames for method, None means method is not allowed.
+
+    """
+    if method not in mapping:
+        return None
+
+    opts = {"app_label": model._meta.app_label, "model_name": model._meta.model_name}
+    return frozenset(permission % opts for permission in mapping[method])
+
+
+def register_permission_plan(endpoint: Callable, methods: set[str], model: type[Model]) -> None:
+    """
+    Function precompiles required permissions for route endpoint methods.
+
+    """
+    for method in methods:
+        _permission_plans[(endpoint, method)] = _get_required_permissions(DEFAULT_PERMISSIONS_MAPPING, method, model)
 
 
 def _get_request_base_model(request: Request) -> Model:
@@ -140,28 +366,34 @@ def _get_request_base_model(request: Request) -> Model:
     return model
 
 
-async def _check_model_permissions(request: Request, model=None) -> None:
+async def _check_model_permissions(request: Request, model=None, loader: Callable = aload_user_permissions) -> None:
     """
     Model Permissions check implementation.
 
+    Required permissions are taken from plan precompiled for route,
+    or resolved and stored on first request.
+
     """
+    if hasattr(request.state, "permissions_mapping"):
+        required = _get_required_permissions(
+            _get_permissions_mapping(request), request.method, _get_request_base_model(request)
+        )
+    else:
+        key = (request.scope["endpoint"], request.method)
 
-    model = _get_request_base_model(request)
+        if (required := _permission_plans.get(key, MISSING)) is MISSING:
+            required = _get_required_permissions(
+                DEFAULT_PERMISSIONS_MAPPING, request.method, _get_request_base_model(request)
+            )
+            _permission_plans[key] = required
 
-    permissions_mapping = _get_permissions_mapping(request)
-    user_permissions = await run_async(_get_user_permissions, context_user.get())
+    if required is not None:
+        if not required:
+            return
 
-    if request.method in permissions_mapping:
-        permissions = permissions_mapping[request.method]
+        user_permissions = await _aget_cached_user_permissions(context_user.get(), loader)
 
-        if not permissions:
+        if not required.isdisjoint(user_permissions):
             return
 
-        for permission in permissions:
-            if (
-                permission % {"app_label": model._meta.app_label, "model_name": model._meta.model_name}
-                in user_permissions
-            ):
-                return
-
     raise HTTPException(status_code=403, detail=_("You do not have permission to perform this action."))
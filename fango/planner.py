@@ -0,0 +1,273 @@
+from functools import lru_cache
+from typing import Any, get_args
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import ManyToOneRel, Model, OneToOneRel, Prefetch, QuerySet
+from pydantic import BaseModel
+
+from fango.utils import get_model_field_safe
+
+__all__ = ["get_values_fields", "get_related_plan", "apply_related_plan", "get_only_fields", "apply_only_fields"]
+
+
+def _get_nested_model(annotation: Any) -> type[BaseModel] | None:
+    """
+    Function returns pydantic model declared by field annotation, like Nested, list[Nested] or Nested | None.
+
+    """
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+
+    for arg in get_args(annotation):
+        if nested := _get_nested_model(arg):
+            return nested
+
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_values_fields(pydantic_model: type[BaseModel], model: type[Model]) -> tuple[str, ...] | None:
+    """
+    Function returns model columns for queryset.values() declared by pydantic model.
+
+    None is returned, if any field is not a column or FK, like property, multiple or nested relation.
+
+    """
+    fields = []
+
+    for field_name, field_info in pydantic_model.model_fields.items():
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return None
+
+        if not field.concrete or field.many_to_many:
+            return None
+
+        if field.is_relation and _get_nested_model(field_info.annotation):
+            return None
+
+        fields.append(field_name)
+
+    return tuple(fields)
+
+
+@lru_cache(maxsize=None)
+def _get_columns(pydantic_model: type[BaseModel], model: type[Model]) -> tuple[str, ...] | None:
+    """
+    Function returns queryset.only() paths of columns read by pydantic model,
+    including columns of nested models loaded with select_related.
+
+    None is returned, if any field is not a column or relation, like property.
+
+    """
+    columns = [model._meta.pk.name]
+
+    for field_name, field_info in pydantic_model.model_fields.items():
+        try:
+            field = get_model_field_safe(model, field_name)
+        except FieldDoesNotExist:
+            return None
+
+        if field.one_to_many or field.many_to_many:
+            continue
+
+        if not field.concrete:
+            return None
+
+        columns.append(field.name)
+
+        if field.is_relation and (nested := _get_nested_model(field_info.annotation)):
+            if (related_columns := _get_columns(nested, field.related_model)) is None:
+                return None
+
+            columns.extend(f"{field.name}__{x}" for x in related_columns)
+
+    return tuple(dict.fromkeys(columns))
+
+
+def _get_prefetch_queryset(field: Any, nested: type[BaseModel] | None) -> tuple[QuerySet, list[Prefetch]]:
+    """
+    Function returns queryset of multiple relation limited to columns of nested pydantic model
+    or to pk for list of PK, and prefetches of nested model relative to this relation.
+
+    Reverse FK queryset keeps FK column, it is used to match rows with parent objects.
+
+    """
+    related_model = field.related_model
+    queryset = related_model._default_manager.all()
+    prefetch_related = []
+
+    if nested:
+        select_related, prefetch_related = get_related_plan(nested, related_model)
+        queryset = queryset.select_related(*select_related)
+        columns = _get_columns(nested, related_model)
+    else:
+        columns = (related_model._meta.pk.name,)
+
+    if columns is not None and (field.many_to_many or isinstance(field, ManyToOneRel)):
+        if isinstance(field, ManyToOneRel):
+            columns = (*columns, field.field.name)
+
+        queryset = queryset.only(*columns)
+
+    return queryset, list(prefetch_related)
+
+
+@lru_cache(maxsize=None)
+def get_related_plan(
+    pydantic_model: type[BaseModel], model: type[Model]
+) -> tuple[tuple[str, ...], tuple[Prefetch, ...]]:
+    """
+    Function returns select_related paths and prefetches for relations read by pydantic model.
+
+    Single relations are joined with select_related, generic and multiple relations are prefetched
+    with querysets limited by only(), so serialization of page reads relations from cache.
+    Nested prefetches are flattened into full paths to keep prefetch querysets immutable.
+
+    """
+    select_related: list[str] = []
+    prefetch_related: list[Prefetch] = []
+
+    for field_name, field_info in pydantic_model.model_fields.items():
+        try:
+            field = get_model_field_safe(model, field_name)
+        except FieldDoesNotExist:
+            continue
+
+        if not field.is_relation or field_name == getattr(field, "attname", None):
+            continue
+
+        nested = _get_nested_model(field_info.annotation)
+
+        if (field.many_to_one or field.one_to_one) and (field.concrete or isinstance(field, OneToOneRel)):
+            select_related.append(field_name)
+
+            if nested:
+                related_select, related_prefetch = get_related_plan(nested, field.related_model)
+                select_related.extend(f"{field_name}__{x}" for x in related_select)
+                prefetch_related.extend(
+                    Prefetch(f"{field_name}__{x.prefetch_through}", queryset=x.queryset) for x in related_prefetch
+                )
+
+        elif field.many_to_one:
+            # GenericForeignKey can't be joined, its related model is known per row.
+            prefetch_related.append(Prefetch(field_name))
+
+        elif field.one_to_many or field.many_to_many:
+            queryset, related_prefetch = _get_prefetch_queryset(field, nested)
+            prefetch_related.append(Prefetch(field_name, queryset=queryset))
+            prefetch_related.extend(
+                Prefetch(f"{field_name}__{x.prefetch_through}", queryset=x.queryset) for x in related_prefetch
+            )
+
+    return tuple(select_related), tuple(prefetch_related)
+
+
+def _get_select_related_paths(queryset: QuerySet) -> set[str]:
+    """
+    Function returns select_related paths declared on queryset, including intermediate paths.
+
+    """
+    paths = set()
+    stack = [("", queryset.query.select_related)]
+
+    while stack:
+        prefix, related = stack.pop()
+
+        if not isinstance(related, dict):
+            continue
+
+        for name, nested in related.items():
+            paths.add(prefix + name)
+            stack.append((f"{prefix}{name}__", nested))
+
+    return paths
+
+
+def _get_prefetch_related_paths(queryset: QuerySet) -> set[str]:
+    """
+    Function returns prefetch_related paths declared on queryset.
+
+    """
+    return {x.prefetch_to if isinstance(x, Prefetch) else x for x in queryset._prefetch_related_lookups}
+
+
+def apply_related_plan(queryset: QuerySet, pydantic_model: type[BaseModel]) -> QuerySet:
+    """
+    Function applies select_related and prefetch_related of pydantic model relations to queryset.
+
+    Relations declared on queryset are kept as is: prefetch of the same path with other queryset
+    is rejected by Django, so plan entries for path or its subpaths declared on queryset are skipped.
+
+    """
+    select_related, prefetch_related = get_related_plan(pydantic_model, queryset.model)
+
+    if queryset.query.select_related is True:
+        select_related = ()
+    elif declared := _get_select_related_paths(queryset):
+        select_related = tuple(x for x in select_related if x not in declared)
+
+    if declared := _get_prefetch_related_paths(queryset):
+        prefetch_related = tuple(
+            x
+            for x in prefetch_related
+            if not any(path == x.prefetch_to or path.startswith(x.prefetch_to + "__") for path in declared)
+        )
+
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+
+    return queryset
+
+
+@lru_cache(maxsize=None)
+def get_only_fields(
+    pydantic_model: type[BaseModel], model: type[Model], ordering: tuple[str, ...] = ()
+) -> tuple[str, ...] | None:
+    """
+    Function returns queryset.only() fields for pydantic model with pk and ordering columns,
+    which are read by cursor pagination.
+
+    None is returned, if pydantic model reads attributes that are not model fields.
+
+    """
+    if (columns := _get_columns(pydantic_model, model)) is None:
+        return None
+
+    for field_name in ordering:
+        field_name = field_name.removeprefix("-")
+
+        if "__" in field_name or field_name == "pk":
+            continue
+
+        try:
+            columns = (*columns, model._meta.get_field(field_name).name)
+        except FieldDoesNotExist:
+            continue
+
+    return tuple(dict.fromkeys(columns))
+
+
+def apply_only_fields(queryset: QuerySet, pydantic_model: type[BaseModel], ordering: tuple[str, ...] = ()) -> QuerySet:
+    """
+    Function limits queryset columns to fields of pydantic model.
+
+    Queryset with explicit only(), defer(), select_related() or prefetch_related() is returned as is,
+    related paths declared on it may need columns, which are not read by pydantic model.
+
+    """
+    if (
+        queryset.query.deferred_loading != (frozenset(), True)
+        or queryset.query.select_related
+        or queryset._prefetch_related_lookups
+    ):
+        return queryset
+
+    if fields := get_only_fields(pydantic_model, queryset.model, ordering):
+        queryset = queryset.only(*fields)
+
+    return queryset
@@ -1,7 +1,6 @@
 from dataclasses import dataclass
-from enum import Enum
 from types import UnionType
-from typing import Any, Generic, TypedDict, TypeVar, get_args
+from typing import Any, ClassVar, Generic, TypedDict, TypeVar, get_args
 from uuid import UUID
 
 from django.db.models import IntegerChoices, Manager
@@ -32,12 +31,14 @@ T = TypeVar("T")
 class Cursor:
     offset: int
     reverse: int
-    position: str | None
+    position: tuple[Any, ...] | None
 
 
 class Page(BaseModel, Generic[T]):
     next: str | None = None
     previous: str | None = None
+    count: int | None = None
+    pages: int | None = None
     results: list[T]
 
 
@@ -59,6 +60,8 @@ class Entry(BaseModel, Generic[T]):
 
 
 class ChoicesItem(BaseModel, Generic[T]):
+    model_config = ConfigDict(frozen=True)
+
     id: T
     name: str | None
 
@@ -66,45 +69,98 @@ class ChoicesItem(BaseModel, Generic[T]):
 class FangoModel(BaseModel):
     model_config = ConfigDict(from_attributes=True, arbitrary_types_allowed=True)
 
+    __choices_fields__: ClassVar[
+        tuple[tuple[str, Any, tuple[tuple[type[IntegerChoices], type[BaseModel] | None], ...]], ...]
+    ] = ()
+
+    # Trusted model declares that values rows match field types, so list routes
+    # serialize rows directly without validation, see fango.serializers.
+    trusted: ClassVar[bool] = False
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        """
+        Precompute fields with choices label conversion once per class.
+
+        """
+        super().__pydantic_init_subclass__(**kwargs)
+        cls.__choices_fields__ = _get_choices_fields(cls)
+
     @field_validator("*", mode="before")
     def model_manager(cls, value: Any, info: FieldValidationInfo):
         if isinstance(value, Manager) and info.field_name:
             annotations = get_args(cls.model_fields[info.field_name].annotation)
 
+            queryset = value.all()
+
             if any(type in annotations for type in [PK, list[PK], int, list[int], UUID, list[UUID]]):
+                # Prefetched relation is read from cache without query.
+                if queryset._result_cache is not None:
+                    return [x.pk for x in queryset]
+
                 return value.values_list("pk", flat=True)
             else:
-                return value.all()
+                return queryset
 
         return value
 
     @model_validator(mode="before")
     @classmethod
     def choices_label(cls, data):
-        from fango.utils import get_choices_label
-
-        for key, field in cls.model_fields.items():
-            value = data.get(key, field.default) if isinstance(data, dict) else getattr(data, key, field.default)
-            for arg in get_args(field.annotation):
-                if not isinstance(arg, UnionType):
-                    if issubclass(arg, IntegerChoices):
-                        label = get_choices_label(arg, value)
-                        data.update({key: label}) if isinstance(data, dict) else setattr(data, key, label)
-
-                    elif issubclass(arg, Enum):
-                        data.update({key: label}) if isinstance(data, dict) else setattr(data, key, label)
-
-                    elif metadata := getattr(arg, "__pydantic_generic_metadata__", None):
-                        if metadata["origin"] is ChoicesItem and value is not None:
-                            label = get_choices_label(metadata["args"][0], value)
-                            (
-                                data.update({key: {"id": value, "name": label}})
-                                if isinstance(data, dict)
-                                else setattr(data, key, {"id": value, "name": label})
-                            )
+        if not cls.__choices_fields__:
+            return data
+
+        from fango.utils import get_choices_item, get_choices_label
+
+        is_dict = isinstance(data, dict)
+
+        for key, default, converters in cls.__choices_fields__:
+            value = data.get(key, default) if is_dict else getattr(data, key, default)
+
+            for enum, item_class in converters:
+                if item_class:
+                    if value is None:
+                        continue
+                    label = get_choices_item(item_class, enum, value)
+                else:
+                    label = get_choices_label(enum, value)
+
+                if is_dict:
+                    data[key] = label
+                else:
+                    setattr(data, key, label)
+
         return data
 
 
+def _get_choices_fields(model: type[BaseModel]) -> tuple:
+    """
+    Function returns fields of model, which need choices label conversion,
+    as (field name, default, ((choices class, ChoicesItem class or None for label), ...)).
+
+    """
+    fields = []
+
+    for key, field in model.model_fields.items():
+        converters = []
+
+        for arg in get_args(field.annotation):
+            if isinstance(arg, UnionType) or not isinstance(arg, type):
+                continue
+
+            if issubclass(arg, IntegerChoices):
+                converters.append((arg, None))
+
+            elif metadata := getattr(arg, "__pydantic_generic_metadata__", None):
+                if metadata["origin"] is ChoicesItem:
+                    converters.append((metadata["args"][0], arg))
+
+        if converters:
+            fields.append((key, field.default, tuple(converters)))
+
+    return tuple(fields)
+
+
 class Multiselect(FangoModel):
     id: int
     name: str | None = None
@@ -0,0 +1,99 @@
+import json
+from functools import lru_cache
+from typing import Any, Callable
+
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+from fango.utils import get_choices_table
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+__all__ = ["is_trusted", "get_row_serializer", "dumps", "TrustedJSONResponse"]
+
+
+def is_trusted(pydantic_model: type[BaseModel]) -> bool:
+    """
+    Function checks that pydantic model is declared trusted,
+    so values rows can be serialized without validation.
+
+    Model with computed fields or custom serializers is not trusted,
+    its JSON is produced by pydantic only.
+
+    """
+    if not getattr(pydantic_model, "trusted", False):
+        return False
+
+    decorators = pydantic_model.__pydantic_decorators__
+
+    return not (pydantic_model.model_computed_fields or decorators.field_serializers or decorators.model_serializers)
+
+
+@lru_cache(maxsize=None)
+def get_row_serializer(pydantic_model: type[BaseModel]) -> Callable[[dict], dict]:
+    """
+    Function returns converter of queryset.values() row to response dict of trusted pydantic model.
+
+    Output keys and choices label tables are resolved once per pydantic model.
+
+    """
+    fields = tuple(
+        (field_name, field.serialization_alias or field.alias or field_name)
+        for field_name, field in pydantic_model.model_fields.items()
+    )
+    aliases = dict(fields)
+    choices = []
+
+    for key, _, converters in getattr(pydantic_model, "__choices_fields__", ()):
+        enum, item_class = converters[-1]
+        table = get_choices_table(enum)
+
+        if item_class:
+            # Items are shared between rows and only read by dumps.
+            table = {value: {"id": value, "name": label} for value, label in table.items()}
+
+        choices.append((aliases[key], table, item_class is not None))
+
+    def serialize(row: dict) -> dict:
+        data = {key: row[field_name] for field_name, key in fields}
+
+        for key, table, as_item in choices:
+            value = data[key]
+
+            if not as_item:
+                data[key] = table.get(value)
+            elif value is not None:
+                data[key] = table.get(value) or {"id": value, "name": None}
+
+        return data
+
+    return serialize
+
+
+def dumps(data: Any) -> bytes:
+    """
+    Function returns JSON bytes of data, orjson is used if installed.
+
+    Types without native JSON form are converted like pydantic does in JSON mode.
+
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=to_jsonable_python, option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+    return json.dumps(data, default=to_jsonable_python, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class TrustedJSONResponse(Response):
+    """
+    JSON response with content rendered by dumps, response_model validation is not applied to it.
+
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
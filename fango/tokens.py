@@ -0,0 +1,208 @@
+from functools import lru_cache
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+from jose import JWTError, jwk, jwt
+
+__all__ = [
+    "TokenError",
+    "JWTBackend",
+    "JoseBackend",
+    "PyJWTBackend",
+    "KeyRegistry",
+    "get_backend",
+    "get_key_registry",
+]
+
+
+class TokenError(Exception):
+    pass
+
+
+class JWTBackend:
+    """
+    Base class for JWT implementation backend.
+
+    Keys passed to encode and decode are objects returned by load_key.
+
+    """
+
+    name: str
+
+    def load_key(self, key: str | bytes, algorithm: str) -> Any:
+        raise NotImplementedError
+
+    def encode(self, claims: dict, key: Any, algorithm: str, headers: dict | None = None) -> str:
+        raise NotImplementedError
+
+    def decode(self, token: str, key: Any, algorithm: str) -> dict:
+        raise NotImplementedError
+
+    def get_unverified_header(self, token: str) -> dict:
+        raise NotImplementedError
+
+
+class JoseBackend(JWTBackend):
+    """
+    Backend based on python-jose.
+
+    """
+
+    name = "jose"
+
+    def load_key(self, key: str | bytes, algorithm: str) -> Any:
+        return jwk.construct(key, algorithm)
+
+    def encode(self, claims: dict, key: Any, algorithm: str, headers: dict | None = None) -> str:
+        return jwt.encode(claims, key, algorithm=algorithm, headers=headers)
+
+    def decode(self, token: str, key: Any, algorithm: str) -> dict:
+        try:
+            return jwt.decode(token, key, algorithms=[algorithm], options={"verify_aud": False})
+        except JWTError as e:
+            raise TokenError(str(e)) from e
+
+    def get_unverified_header(self, token: str) -> dict:
+        try:
+            return jwt.get_unverified_header(token)
+        except JWTError as e:
+            raise TokenError(str(e)) from e
+
+
+class PyJWTBackend(JWTBackend):
+    """
+    Backend based on PyJWT, it is faster than python-jose with cryptography keys.
+
+    Requires optional PyJWT package.
+
+    """
+
+    name = "pyjwt"
+
+    def __init__(self) -> None:
+        try:
+            import jwt as pyjwt
+        except ImportError:
+            raise ImproperlyConfigured("PyJWT package is required for PyJWTBackend.")
+
+        self._jwt = pyjwt
+
+    def load_key(self, key: str | bytes, algorithm: str) -> Any:
+        return self._jwt.algorithms.get_default_algorithms()[algorithm].prepare_key(key)
+
+    def encode(self, claims: dict, key: Any, algorithm: str, headers: dict | None = None) -> str:
+        return self._jwt.encode(claims, key, algorithm=algorithm, headers=headers)
+
+    def decode(self, token: str, key: Any, algorithm: str) -> dict:
+        try:
+            return self._jwt.decode(token, key, algorithms=[algorithm], options={"verify_aud": False})
+        except self._jwt.PyJWTError as e:
+            raise TokenError(str(e)) from e
+
+    def get_unverified_header(self, token: str) -> dict:
+        try:
+            return self._jwt.get_unverified_header(token)
+        except self._jwt.PyJWTError as e:
+            raise TokenError(str(e)) from e
+
+
+BACKENDS = {
+    JoseBackend.name: JoseBackend,
+    PyJWTBackend.name: PyJWTBackend,
+}
+
+
+class KeyRegistry:
+    """
+    Registry of parsed signing and verifying keys.
+
+    Keys are looked up by token "kid" header, it allows to rotate keys:
+    new tokens are signed by active key, and old ones are still verified.
+
+    """
+
+    def __init__(
+        self,
+        backend: JWTBackend,
+        algorithm: str,
+        keys: dict[str | None, tuple[str | bytes | None, str | bytes | None]],
+        active_kid: str | None = None,
+    ) -> None:
+        if active_kid not in keys:
+            raise ImproperlyConfigured(f"Active key id {active_kid!r} is not registered.")
+
+        self.backend = backend
+        self.algorithm = algorithm
+        self.active_kid = active_kid
+        self.signing_keys = {
+            kid: backend.load_key(signing, algorithm) for kid, (signing, _) in keys.items() if signing is not None
+        }
+        self.verifying_keys = {
+            kid: backend.load_key(verifying, algorithm) for kid, (_, verifying) in keys.items() if verifying is not None
+        }
+
+    @classmethod
+    def from_settings(cls, backend: JWTBackend) -> "KeyRegistry":
+        """
+        Method creates registry from JWT_KEYS setting like {kid: {"private": ..., "public": ...}}
+        with JWT_ACTIVE_KID, or from SECRET_KEY and PUBLIC_KEY settings.
+
+        """
+        if jwt_keys := getattr(settings, "JWT_KEYS", None):
+            keys = {kid: (value.get("private"), value.get("public")) for kid, value in jwt_keys.items()}
+            active_kid = getattr(settings, "JWT_ACTIVE_KID", next(iter(jwt_keys)))
+        else:
+            keys = {None: (settings.SECRET_KEY, settings.PUBLIC_KEY)}
+            active_kid = None
+
+        return cls(backend, settings.ALGORITHM, keys, active_kid)
+
+    def encode(self, claims: dict) -> str:
+        """
+        Method signs claims with active key.
+
+        """
+        try:
+            key = self.signing_keys[self.active_kid]
+        except KeyError:
+            raise ImproperlyConfigured("Active key has no private part.")
+
+        headers = {"kid": self.active_kid} if self.active_kid is not None else None
+        return self.backend.encode(claims, key, self.algorithm, headers=headers)
+
+    def decode(self, token: str) -> dict:
+        """
+        Method verifies token with key selected by token kid header.
+
+        """
+        if len(self.verifying_keys) == 1 and self.active_kid is None:
+            key = self.verifying_keys[None]
+        else:
+            kid = self.backend.get_unverified_header(token).get("kid", self.active_kid)
+            try:
+                key = self.verifying_keys[kid]
+            except KeyError:
+                raise TokenError("Unknown key id.")
+
+        return self.backend.decode(token, key, self.algorithm)
+
+
+@lru_cache(maxsize=None)
+def get_backend() -> JWTBackend:
+    """
+    Function returns JWT backend by JWT_BACKEND setting, it may be a name or dotted path.
+
+    """
+    backend = getattr(settings, "JWT_BACKEND", JoseBackend.name)
+    return (BACKENDS.get(backend) or import_string(backend))()
+
+
+@lru_cache(maxsize=None)
+def get_key_registry() -> KeyRegistry:
+    """
+    Function returns key registry, keys are parsed once per process.
+
+    """
+    return KeyRegistry.from_settings(get_backend())
@@ -1,19 +1,20 @@
 import asyncio
 import types
-from functools import wraps
+from functools import lru_cache
 from inspect import iscoroutinefunction
-from typing import TYPE_CHECKING, Any, Callable
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from django.contrib.contenttypes.fields import GenericForeignKey
 
 from django.conf import settings
-from django.core.cache import cache
 from django.core.exceptions import FieldDoesNotExist
 from django.db.models import Choices, Field, ForeignObjectRel, Model
 from django.db.models.enums import ChoicesMeta
 from fastapi.concurrency import run_in_threadpool
 
+from fango.cache import cached
 from fango.generics import MethodT
 from fango.routing import FangoRouter
 from fango.schemas import ChoicesItem
@@ -27,6 +28,9 @@ __all__ = [
     "get_choices_as_data",
     "copy_instance_method",
     "get_choices_label",
+    "get_choices_table",
+    "get_choices_items_table",
+    "get_choices_item",
     "get_model_field_safe",
     "generate_tags_metadata",
 ]
@@ -34,25 +38,10 @@ __all__ = [
 
 def ttl_cache(ttl=None) -> Any:
     """
-    Decorator for TTL caching.
+    Decorator for TTL caching in process memory.
 
     """
-
-    def decorator(func: Callable):
-        @wraps(func)
-        def wrapped(*args, **kwargs) -> Callable:
-            key = "ttl_cache_key_{}_{}".format(func.__name__, hash(args) + hash(frozenset(kwargs.items())))
-            result = cache.get(key)
-            if result is not None:
-                return result
-            else:
-                result = func(*args, **kwargs)
-            cache.set(key, result, timeout=ttl)
-            return result
-
-        return wrapped
-
-    return decorator
+    return cached(ttl=ttl)
 
 
 def reverse_ordering(ordering_tuple: tuple[str, ...]) -> tuple[str, ...]:
@@ -97,8 +86,10 @@ def get_choices_as_data(choices_class: ChoicesMeta) -> list[ChoicesItem]:
     """
     Function for get choices enum as key value data.
 
+    Items are frozen and built once per choices class, list is new for each call.
+
     """
-    return [ChoicesItem.model_validate({"id": value, "name": label}) for value, label in choices_class.choices]
+    return list(get_choices_items_table(ChoicesItem, choices_class).values())
 
 
 def copy_instance_method(method: MethodT) -> MethodT:
@@ -118,13 +109,42 @@ def copy_instance_method(method: MethodT) -> MethodT:
     )
 
 
+@lru_cache(maxsize=None)
+def get_choices_table(enum: type[Choices]) -> MappingProxyType:
+    """
+    Function returns read only mapping of choices values to labels, built once per choices class.
+
+    """
+    return MappingProxyType(dict(enum.choices))
+
+
 def get_choices_label(enum: type[Choices], value: int) -> str | None:
     """
     Function returns choices text.
 
     """
-    choices_dict = dict(enum.choices)
-    return choices_dict.get(value)
+    return get_choices_table(enum).get(value)
+
+
+@lru_cache(maxsize=None)
+def get_choices_items_table(item_class: type[ChoicesItem], enum: type[Choices]) -> MappingProxyType:
+    """
+    Function returns read only mapping of choices values to frozen items of item_class,
+    like ChoicesItem[Status], built once per item class and choices class.
+
+    """
+    return MappingProxyType({value: item_class(id=value, name=label) for value, label in enum.choices})
+
+
+def get_choices_item(item_class: type[ChoicesItem], enum: type[Choices], value: Any) -> ChoicesItem:
+    """
+    Function returns prebuilt choices item by value, item without name is built for unknown value.
+
+    """
+    if (item := get_choices_items_table(item_class, enum).get(value)) is None:
+        item = item_class(id=value, name=None)
+
+    return item
 
 
 def get_model_field_safe(model: type[Model], field_name: str) -> "Field | ForeignObjectRel | GenericForeignKey":
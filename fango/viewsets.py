@@ -1,18 +1,31 @@
+import asyncio
+import csv
 import inspect
+import io
+import json
+import time
 from copy import deepcopy
 from types import FunctionType, MethodType, UnionType
-from typing import Generic, TypeVar, cast
+from typing import AsyncIterator, Generic, TypeVar, cast
 
-from django.db.models import ProtectedError, QuerySet
+import django
+from asgiref.sync import sync_to_async
+from django.db.models import ProtectedError, Q, QuerySet, prefetch_related_objects
 from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
 from fastapi.routing import APIRoute
 from pydantic import BaseModel
 
-from fango.filters import generate_filterset_by_pydantic
+from fango import advisor
+from fango.auth import context_request
+from fango.filters import SEARCH_RANK, apply_filterset, generate_filterset_by_pydantic
 from fango.generics import BaseModelT, ModelT
-from fango.permissions import PermissionDependency
+from fango.pagination import CursorPagination
+from fango.permissions import PermissionDependency, register_permission_plan
+from fango.planner import apply_only_fields, apply_related_plan, get_values_fields
 from fango.routing import FangoRouter, action
-from fango.schemas import ActionClasses
+from fango.schemas import ActionClasses, Page
+from fango.serializers import TrustedJSONResponse, get_row_serializer, is_trusted
 from fango.utils import copy_instance_method
 
 
@@ -32,6 +45,15 @@ class AsyncGenericViewSet(Generic[BaseModelT]):
     dependencies = []
     strict_filter_by = None
     read_only: bool = False
+    pagination_class = CursorPagination
+    page_size: int = 20
+    ordering: tuple[str, ...] = ("-pk",)
+    values_mode: bool = False
+    count_mode: str | None = None
+    export_param: str = "export"
+    export_chunk_size: int = 2000
+    prefetch_plan: bool = True
+    projection: bool = False
 
     def __init__(self, router: FangoRouter, basename: str) -> None:
         self.pydantic_model = self.__get_pydantic_model_or_table_action_class()
@@ -123,6 +145,10 @@ class AsyncGenericViewSet(Generic[BaseModelT]):
 
         router.routes = [*router.routes, *self.__get_actual_routes_from_action_router()]
 
+        if hasattr(self, "queryset"):
+            for route in router.routes:
+                register_permission_plan(route.endpoint, route.methods, self.queryset.model)  # type: ignore
+
         self._router.include_router(router=router, prefix=f"/{self._basename}", tags=[self._basename])
 
     def __get_route_endpoint(self, route: APIRoute) -> MethodType:
@@ -198,12 +224,203 @@ class AsyncGenericViewSet(Generic[BaseModelT]):
         else:
             return self.__get_pydantic_model_or_table_action_class()
 
+    def get_values_fields(self, request: Request) -> tuple[str, ...] | None:
+        """
+        Method returns columns of route pydantic model for values mode pagination,
+        or None if values mode is disabled or model has not column fields.
+
+        """
+        if not self.values_mode:
+            return None
+
+        return get_values_fields(self.get_pydantic_model_class(request), self.queryset.model)
+
+    def filter_queryset(self, request: Request, queryset: QuerySet) -> QuerySet:
+        """
+        Method applies filterset_class to queryset by request query params.
+
+        """
+        return apply_filterset(self.filterset_class, request.query_params, queryset)
+
+    async def paginate(self, request: Request, queryset: QuerySet) -> Page | StreamingResponse | TrustedJSONResponse:
+        """
+        Method returns page of queryset for list route.
+
+        In values mode only route pydantic model columns are selected,
+        and dicts are validated instead of model instances.
+        Rows of trusted route pydantic model are selected as dicts and rendered to JSON
+        without validation, if model has column fields only.
+        With count_mode total count is queried concurrently with page.
+        With export query param all rows are streamed, see export method.
+        Full-text search results are ordered by rank first.
+
+        """
+        if export_format := request.query_params.get(self.export_param):
+            return self.export(request, queryset, export_format)
+
+        ordering = self.ordering
+        if SEARCH_RANK in queryset.query.annotations:
+            ordering = ("-" + SEARCH_RANK, *ordering)
+
+        pydantic_model = self.get_pydantic_model_class(request)
+        trusted_fields = is_trusted(pydantic_model) and get_values_fields(pydantic_model, self.queryset.model)
+
+        pagination = self.pagination_class(
+            request,
+            self.page_size,
+            ordering,
+            values=trusted_fields or self.get_values_fields(request),
+            count_mode=self.count_mode,
+        )
+
+        started = time.perf_counter()
+
+        if self.count_mode:
+            page, _ = await asyncio.gather(pagination.aget_page(queryset), pagination.aget_count(queryset))
+        else:
+            page = await pagination.aget_page(queryset)
+
+        if advisor.FILTER_ADVISOR and (
+            filter_names := [x for x in request.query_params if x in self.filterset_class.base_filters]
+        ):
+            await advisor.arecord_filter_usage(self.queryset.model, filter_names, time.perf_counter() - started)
+
+        if trusted_fields:
+            serialize = get_row_serializer(pydantic_model)
+            content = pagination.get_page_response([]).model_dump(exclude_unset=True)
+            content["results"] = [serialize(row) for row in page]
+            return TrustedJSONResponse(content)
+
+        return pagination.get_page_response(page)
+
+    def export(self, request: Request, queryset: QuerySet, export_format: str) -> StreamingResponse:
+        """
+        Method streams all queryset rows as NDJSON or CSV with constant memory,
+        rows are fetched by chunks with database cursor.
+
+        """
+        if export_format not in ("ndjson", "csv"):
+            raise HTTPException(status_code=400, detail=f"Unsupported export format: {export_format}.")
+
+        pydantic_model = self.get_pydantic_model_class(request)
+
+        prefetch_lookups = ()
+
+        if fields := get_values_fields(pydantic_model, self.queryset.model):
+            queryset = queryset.values(*fields)
+        elif django.VERSION < (5, 0) and queryset._prefetch_related_lookups:
+            # aiterator() supports prefetch_related() since Django 5.0, before relations are fetched per chunk.
+            prefetch_lookups = queryset._prefetch_related_lookups
+            queryset = queryset.prefetch_related(None)
+
+        rows = queryset.order_by(*self.ordering).aiterator(chunk_size=self.export_chunk_size)
+
+        if prefetch_lookups:
+            rows = self.__prefetch_chunks(rows, prefetch_lookups)
+
+        if export_format == "ndjson":
+            content, media_type = self.__export_ndjson(pydantic_model, rows), "application/x-ndjson"
+        else:
+            content, media_type = self.__export_csv(pydantic_model, rows), "text/csv"
+
+        return StreamingResponse(
+            content,
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{self._basename}.{export_format}"'},
+        )
+
+    async def __prefetch_chunks(self, rows: AsyncIterator, lookups: tuple) -> AsyncIterator:
+        chunk = []
+
+        async for row in rows:
+            chunk.append(row)
+
+            if len(chunk) >= self.export_chunk_size:
+                await sync_to_async(prefetch_related_objects)(chunk, *lookups)
+                for item in chunk:
+                    yield item
+                chunk = []
+
+        if chunk:
+            await sync_to_async(prefetch_related_objects)(chunk, *lookups)
+            for item in chunk:
+                yield item
+
+    async def __export_ndjson(self, pydantic_model: BaseModelT, rows: AsyncIterator) -> AsyncIterator[str]:
+        chunk = []
+
+        async for row in rows:
+            chunk.append(json.dumps(pydantic_model.model_validate(row).model_dump(mode="json"), ensure_ascii=False))
+
+            if len(chunk) >= self.export_chunk_size:
+                yield "\n".join(chunk) + "\n"
+                chunk = []
+
+        if chunk:
+            yield "\n".join(chunk) + "\n"
+
+    async def __export_csv(self, pydantic_model: BaseModelT, rows: AsyncIterator) -> AsyncIterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        field_names = list(pydantic_model.model_fields)
+        writer.writerow(field_names)
+        count = 0
+
+        async for row in rows:
+            data = pydantic_model.model_validate(row).model_dump(mode="json")
+            writer.writerow(
+                [json.dumps(x, ensure_ascii=False) if isinstance(x, dict | list) else x for x in data.values()]
+            )
+            count += 1
+
+            if count % self.export_chunk_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+
     async def get_queryset(self, request: Request) -> QuerySet:
         """
         Method for get queryset defined in ViewSet.
 
+        Queryset is limited by filters of route permissions.
+        Relations of route pydantic model are joined or prefetched, if prefetch_plan is enabled.
+        Columns of GET routes are limited to route pydantic model fields, if projection is enabled too,
+        other fields are loaded on access, so projection is opt-in.
+
         """
-        return self.queryset
+        queryset = self.queryset
+        pydantic_model = self.get_pydantic_model_class(request)
+
+        if self.prefetch_plan:
+            # Projection is checked against relations declared on viewset queryset,
+            # its paths of nested models rely on select_related of related plan.
+            if self.projection and request.method == "GET":
+                queryset = apply_only_fields(queryset, pydantic_model, self.ordering)
+
+            queryset = apply_related_plan(queryset, pydantic_model)
+
+        for query in self.get_permissions_filters(request):
+            queryset = queryset.filter(query)
+
+        return queryset
+
+    def get_permissions_filters(self, request: Request) -> list[Q]:
+        """
+        Method returns non-empty row filters of route permissions.
+
+        """
+        filters = []
+
+        for dependency in request.scope["route"].dependencies:
+            if isinstance(dependency, PermissionDependency) or (
+                isinstance(dependency, type) and issubclass(dependency, PermissionDependency)
+            ):
+                if query := dependency.get_queryset_filter(request):
+                    filters.append(query)
+
+        return filters
 
 
 class CRUDMixin(Generic[BaseModelT, ModelT]):
@@ -220,14 +437,21 @@ class CRUDMixin(Generic[BaseModelT, ModelT]):
         """
         Method for update entry.
 
+        Entry must be visible in queryset limited by route permissions.
+
         """
+        await self.__check_entry_visible(request, pk)
         return await self.queryset.model.save_from_schema(payload, pk)
 
-    async def delete_entry(self, pk: int) -> None:
+    async def delete_entry(self, pk: int, request: Request | None = None) -> None:
         """
         Method for delete entry.
 
+        Entry must be visible in queryset limited by route permissions,
+        request is taken from context_request set by permission dependency if it is not passed.
+
         """
+        await self.__check_entry_visible(request or context_request.get(), pk)
 
         instance = await self.queryset.aget(pk=pk)
 
@@ -242,3 +466,19 @@ class CRUDMixin(Generic[BaseModelT, ModelT]):
                 status_code=400,
                 detail=f"Can't delete object {label} id={pk} by protected relations: {relations}",
             )
+
+    async def __check_entry_visible(self, request: Request | None, pk: int) -> None:
+        """
+        Method checks entry by row filters of route permissions, query is skipped without filters.
+        Request without permission dependency has no filters.
+
+        """
+        if request is None or not (filters := self.get_permissions_filters(request)):  # type: ignore
+            return
+
+        queryset = self.queryset
+        for query in filters:
+            queryset = queryset.filter(query)
+
+        if not await queryset.filter(pk=pk).aexists():
+            raise HTTPException(status_code=404, detail="Not found.")